@@ -1,35 +1,316 @@
-from flask import Flask, request, jsonify, render_template_string
+import time
+_import_started = time.perf_counter()
+
+from flask import (Flask, Blueprint, Request, Response, current_app, request, jsonify, render_template_string,
+                   stream_with_context)
 import os
 import PyPDF2
-import spacy
-from textblob import TextBlob
 import logging
 import re
-import pandas as pd
-
-app = Flask(__name__)
+import io
+import json
+import hashlib
+import sqlite3
+import zipfile
+import argparse
+import glob
+import sys
+import signal
+import tempfile
+import threading
+import resource
+import uuid
+import datetime
+import importlib.util
+import xml.etree.ElementTree as ElementTree
+import multiprocessing
+import atexit
+import fcntl
+import shutil
+import subprocess
+from array import array
+import numpy as np
+from scipy import sparse
+from collections import namedtuple, deque, OrderedDict
+from functools import partial
+from itertools import islice
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from queue import Queue, Empty, Full
+from werkzeug.exceptions import RequestEntityTooLarge
 
 
 from flask_cors import CORS
 
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "http://localhost:5173","methods": ["POST"]}})
+
+class SpooledUploadRequest(Request):
+    """Request that keeps uploads in memory when the body is small.
+
+    When the whole body exceeds UPLOAD_SPOOL_THRESHOLD bytes (or its length is
+    unknown), each file goes to an anonymous temporary file private to the
+    request instead, so a batch of many files cannot exhaust memory and
+    concurrent requests never share a path on disk.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_THRESHOLD:
+            return io.BytesIO()
+        return tempfile.TemporaryFile('w+b')
+
+    # Set by streaming views that keep reading uploads after the view returns
+    defer_close = False
+
+    @property
+    def max_content_length(self):
+        """Body size limit, enforced by Werkzeug while the body streams in"""
+        if self.endpoint in ('api.analyze_batch', 'api.match_job_description'):
+            return MAX_BATCH_UPLOAD_BYTES
+        return MAX_UPLOAD_BYTES
+
+    def close(self):
+        if not self.defer_close:
+            super().close()
+
+
+# Routes are registered on a blueprint so create_app can build fresh instances
+api = Blueprint('api', __name__)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure upload folder
-UPLOAD_FOLDER = 'uploads'
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# Request bodies larger than this write each upload to an anonymous temporary file
+UPLOAD_SPOOL_THRESHOLD = int(os.environ.get('UPLOAD_SPOOL_THRESHOLD', 8 * 1024 * 1024))
+
+# Directory where every process writes its metrics for /metrics to add up, as server workers each keep
+# their own; unset serves only the metrics of the process that answers
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_DUMP_SECONDS = float(os.environ.get('METRICS_DUMP_SECONDS', 5))
+
+# Configure the analysis result cache; RESULT_CACHE_DB enables the persistent SQLite tier, which drops
+# results older than RESULT_CACHE_DB_TTL seconds and the oldest ones beyond RESULT_CACHE_DB_MAX_BYTES
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 1024))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RESULT_CACHE_DB = os.environ.get('RESULT_CACHE_DB')
+RESULT_CACHE_DB_MAX_BYTES = int(os.environ.get('RESULT_CACHE_DB_MAX_BYTES', 1024 * 1024 * 1024))
+RESULT_CACHE_DB_TTL = float(os.environ.get('RESULT_CACHE_DB_TTL', 7 * 24 * 3600))
+
+# Configure the per-section cache that lets an edited resume reuse the work on its unchanged sections,
+# and how many past analyses are kept by ID for previous_id diffs. ANALYSIS_HISTORY_DB keeps them in
+# SQLite as well, so every worker process can diff against an analysis any other one made
+SECTION_CACHE_MAX_ENTRIES = int(os.environ.get('SECTION_CACHE_MAX_ENTRIES', 4096))
+SECTION_CACHE_MAX_BYTES = int(os.environ.get('SECTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+ANALYSIS_HISTORY_MAX_ENTRIES = int(os.environ.get('ANALYSIS_HISTORY_MAX_ENTRIES', 1024))
+ANALYSIS_HISTORY_MAX_BYTES = int(os.environ.get('ANALYSIS_HISTORY_MAX_BYTES', 64 * 1024 * 1024))
+ANALYSIS_HISTORY_DB = os.environ.get('ANALYSIS_HISTORY_DB')
+
+# Directory holding the candidate index used for reverse search; unset keeps it in memory
+CANDIDATE_INDEX_DIR = os.environ.get('CANDIDATE_INDEX_DIR')
+CANDIDATE_INDEX_AUTOSAVE = int(os.environ.get('CANDIDATE_INDEX_AUTOSAVE', 1000))
+
+# Directory that receives one Parquet row per analysis for offline analytics; unset disables the export.
+# Rows are written in groups of ANALYTICS_BATCH_ROWS, or whatever arrived within ANALYTICS_FLUSH_SECONDS,
+# and a new file is started once the current one reaches ANALYTICS_ROLL_BYTES or ANALYTICS_ROLL_SECONDS
+ANALYTICS_DIR = os.environ.get('ANALYTICS_DIR')
+ANALYTICS_MAX_PENDING = int(os.environ.get('ANALYTICS_MAX_PENDING', 10000))
+ANALYTICS_BATCH_ROWS = int(os.environ.get('ANALYTICS_BATCH_ROWS', 1000))
+ANALYTICS_FLUSH_SECONDS = float(os.environ.get('ANALYTICS_FLUSH_SECONDS', 10))
+ANALYTICS_ROLL_BYTES = int(os.environ.get('ANALYTICS_ROLL_BYTES', 128 * 1024 * 1024))
+ANALYTICS_ROLL_SECONDS = float(os.environ.get('ANALYTICS_ROLL_SECONDS', 3600))
+
+# Configure job description matching; JD_SKILL_WEIGHT is the share of the score from skill coverage,
+# the rest comes from BM25 text relevance. JD_INDEX_DB stores the JDs for every process sharing it; unset
+# keeps them in a temporary database of this process's own
+JD_INDEX_DB = os.environ.get('JD_INDEX_DB')
+JD_INDEX_MAX_ENTRIES = int(os.environ.get('JD_INDEX_MAX_ENTRIES', 1000))
+JD_SKILL_WEIGHT = float(os.environ.get('JD_SKILL_WEIGHT', 0.7))
+
+# Configure asynchronous analysis jobs. JOB_WORKERS caps the worker processes draining JOB_QUEUE_DB across
+# all web processes sharing it; unset keeps the queue in a temporary database of this process's own, handed
+# to the workers it starts. JOB_WORKERS_AUTOSTART=0 leaves starting them to 'python app.py --job-worker'
+JOB_QUEUE_DB = os.environ.get('JOB_QUEUE_DB')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_WORKERS_AUTOSTART = os.environ.get('JOB_WORKERS_AUTOSTART', '1') == '1'
+JOB_QUEUE_MAX_PENDING = int(os.environ.get('JOB_QUEUE_MAX_PENDING', 100))
+JOB_TIMEOUT = int(os.environ.get('JOB_TIMEOUT', 300))
+JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 3600))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 0.2))
+
+# Bump when a change to the analysis code alters its output
+ANALYSIS_VERSION = 5
+
+# Configure PDF extraction. Pool processes are started with WORKER_START_METHOD rather than forked
+# from the threaded server, so they never inherit a lock another thread held
+WORKER_PROCESSES = int(os.environ.get('WORKER_PROCESSES', os.cpu_count() or 1))
+WORKER_START_METHOD = os.environ.get('WORKER_START_METHOD', 'forkserver')
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 8))
+PDF_PAGES_PER_TASK = int(os.environ.get('PDF_PAGES_PER_TASK', 4))
+PDF_PAGE_TIMEOUT = float(os.environ.get('PDF_PAGE_TIMEOUT', 10))
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 100))
+
+# PDF text backends in the order they are tried; a page that comes out empty or garbled is retried
+# with the next one. 'auto' stands for every installed backend, fastest first
+PDF_BACKENDS = [name.strip() for name in os.environ.get('PDF_BACKENDS', 'pypdf2,pypdfium2,pdfminer').split(',')
+                if name.strip()]
+
+# Configure guardrails for hostile or oversized uploads. Larger bodies get a 413, PDFs over
+# PDF_REJECT_PAGES pages or MAX_TEXT_CHARS characters of text a 422. Text extraction runs in a pool
+# of pre-started sandbox processes with address space and CPU time limits; a task running past
+# EXTRACTION_TIMEOUT has its process killed and replaced, and each process is replaced after
+# EXTRACTION_MAX_TASKS tasks. Each server process keeps EXTRACTION_SANDBOX_PROCESSES of them, while
+# job workers extract in place under the same limits
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 10 * 1024 * 1024))
+MAX_BATCH_UPLOAD_BYTES = int(os.environ.get('MAX_BATCH_UPLOAD_BYTES', 256 * 1024 * 1024))
+PDF_REJECT_PAGES = int(os.environ.get('PDF_REJECT_PAGES', 1000))
+MAX_TEXT_CHARS = int(os.environ.get('MAX_TEXT_CHARS', 500000))
+EXTRACTION_SANDBOX = os.environ.get('EXTRACTION_SANDBOX', '1') == '1'
+EXTRACTION_MEMORY_MB = int(os.environ.get('EXTRACTION_MEMORY_MB', 512))
+EXTRACTION_CPU_SECONDS = int(os.environ.get('EXTRACTION_CPU_SECONDS', 30))
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', 60))
+EXTRACTION_MAX_TASKS = int(os.environ.get('EXTRACTION_MAX_TASKS', 100))
+EXTRACTION_SANDBOX_PROCESSES = int(os.environ.get('EXTRACTION_SANDBOX_PROCESSES', 2))
+
+# Heavy optional dependencies are loaded on first use; list any to skip in
+# DISABLED_COMPONENTS, e.g. DISABLED_COMPONENTS=spacy,pyarrow
+DISABLED_COMPONENTS = {name.strip() for name in os.environ.get('DISABLED_COMPONENTS', '').split(',') if name.strip()}
+SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+
+# Sentiment is scored from a precompiled lexicon ('lexicon') or by running TextBlob ('textblob')
+SENTIMENT_BACKEND = os.environ.get('SENTIMENT_BACKEND', 'lexicon')
+SENTIMENT_LEXICON_PATH = os.environ.get('SENTIMENT_LEXICON_PATH')
+SENTIMENT_PER_SECTION = os.environ.get('SENTIMENT_PER_SECTION', '1') == '1'
+
+# Skill, role and course tables are read from these data files and reloaded when they change.
+# ROLE_CATALOGUE_PATH may also hold a bare role mapping, where required_skills may map each skill to a weight
+TAXONOMY_DIR = os.environ.get('TAXONOMY_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+SKILLS_PATH = os.environ.get('SKILLS_PATH', os.path.join(TAXONOMY_DIR, 'skills.json'))
+ROLE_CATALOGUE_PATH = os.environ.get('ROLE_CATALOGUE_PATH', os.path.join(TAXONOMY_DIR, 'roles.json'))
+COURSES_PATH = os.environ.get('COURSES_PATH', os.path.join(TAXONOMY_DIR, 'courses.json'))
+TAXONOMY_RELOAD_INTERVAL = float(os.environ.get('TAXONOMY_RELOAD_INTERVAL', 30))
+
+# Entities are extracted with rules ('rules') or with spaCy's NER for employers and institutions ('spacy')
+ENTITY_BACKEND = os.environ.get('ENTITY_BACKEND', 'rules')
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # Peak rather than current RSS, but still comparable between runs
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _load_spacy():
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL)
+    except OSError:
+        logger.error(f"Failed to load spaCy model. Please install it using: python -m spacy download {SPACY_MODEL}")
+        return None
+
+
+def _load_textblob():
+    from textblob import TextBlob
+    return TextBlob
+
+
+def _load_sentiment_lexicon():
+    path = SENTIMENT_LEXICON_PATH
+    if not path:
+        # Reuse the lexicon shipped with TextBlob without importing TextBlob itself
+        spec = importlib.util.find_spec('textblob')
+        if spec is None or not spec.submodule_search_locations:
+            raise ImportError('No sentiment lexicon: install textblob or set SENTIMENT_LEXICON_PATH')
+        path = os.path.join(spec.submodule_search_locations[0], 'en', 'en-sentiment.xml')
+    return compile_sentiment_lexicon(path)
+
+
+def _load_pyarrow():
+    import pyarrow
+    import pyarrow.parquet
+    return pyarrow
+
+
+def _load_pypdf():
+    import pypdf
+    return pypdf
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    logger.error("Failed to load spaCy model. Please install it using: python -m spacy download en_core_web_sm")
-    nlp = None
+
+def _load_pdfminer():
+    import pdfminer.converter
+    import pdfminer.layout
+    import pdfminer.pdfinterp
+    import pdfminer.pdfpage
+    return pdfminer
+
+
+def _load_pypdfium2():
+    import pypdfium2
+    return pypdfium2
+
+
+COMPONENT_LOADERS = {
+    'spacy': _load_spacy,
+    'textblob': _load_textblob,
+    'sentiment_lexicon': _load_sentiment_lexicon,
+    'pyarrow': _load_pyarrow,
+    'pypdf': _load_pypdf,
+    'pdfminer': _load_pdfminer,
+    'pypdfium2': _load_pypdfium2
+}
+
+_components = {}
+_component_report = {}
+_component_lock = threading.Lock()
+
+
+def get_component(name):
+    """Return a heavy dependency, loading it on first use.
+
+    Returns None when the component is disabled or cannot be loaded, so
+    callers must be able to do without it.
+    """
+    if name in _components:
+        return _components[name]
+
+    with _component_lock:
+        if name not in _components:
+            if name in DISABLED_COMPONENTS:
+                _components[name] = None
+                _component_report[name] = {'status': 'disabled'}
+            else:
+                started = time.perf_counter()
+                rss_before = current_rss_mb()
+                try:
+                    component = COMPONENT_LOADERS[name]()
+                except ImportError as e:
+                    logger.error(f"Failed to import {name}: {str(e)}")
+                    component = None
+                _components[name] = component
+                _component_report[name] = {
+                    'status': 'loaded' if component is not None else 'unavailable',
+                    'load_seconds': round(time.perf_counter() - started, 3),
+                    'rss_delta_mb': round(current_rss_mb() - rss_before, 1)
+                }
+                logger.info(f"Loaded component {name}: {_component_report[name]}")
+
+    return _components[name]
+
+
+def startup_report():
+    """Summarize import time, memory and which components have been loaded"""
+    return {
+        'import_seconds': round(STARTUP_SECONDS, 3),
+        'rss_mb': round(current_rss_mb(), 1),
+        'disabled_components': sorted(DISABLED_COMPONENTS),
+        'components': {name: _component_report.get(name, {'status': 'not loaded'})
+                       for name in COMPONENT_LOADERS}
+    }
 
 # Define TEMPLATES variable
 TEMPLATES = """
@@ -200,80 +481,2293 @@ TEMPLATES = """
 </html>
 """
 
-@app.route('/')
+class Metrics:
+    """Thread-safe counters and histograms in the Prometheus text format, summed across processes sharing a directory"""
+
+    def __init__(self, directory=None, dump_seconds=METRICS_DUMP_SECONDS):
+        self._lock = threading.Lock()
+        self._meta = {}
+        self._counters = {}
+        self._histograms = {}
+        self.directory = directory
+        self.dump_seconds = dump_seconds
+        self._dumper_pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def counter(self, name, help_text):
+        self._meta[name] = ('counter', help_text, None)
+
+    def histogram(self, name, help_text, buckets):
+        self._meta[name] = ('histogram', help_text, tuple(buckets))
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            start_dumper = self._claim_dumper()
+        if start_dumper:
+            threading.Thread(target=self._dump_periodically, name='metrics-dump', daemon=True).start()
+
+    def observe(self, name, value, **labels):
+        buckets = self._meta[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            series[0][bisect_left(buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+            start_dumper = self._claim_dumper()
+        if start_dumper:
+            threading.Thread(target=self._dump_periodically, name='metrics-dump', daemon=True).start()
+
+    def _claim_dumper(self):
+        # Called with the lock held; the first series recorded in a process starts its dump thread
+        if not self.directory or self._dumper_pid == os.getpid():
+            return False
+        self._dumper_pid = os.getpid()
+        return True
+
+    def _dump_periodically(self):
+        while True:
+            time.sleep(self.dump_seconds)
+            try:
+                self.dump()
+            except OSError as e:
+                logger.warning(f"Could not write metrics to {self.directory}: {str(e)}")
+
+    def reset_after_fork(self):
+        """Start a forked process from empty series, as the parent's are already counted in its own file"""
+        self._lock = threading.Lock()
+        self._counters, self._histograms = {}, {}
+        self._dumper_pid = None
+
+    def _snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(series[0]), series[1], series[2]) for key, series in self._histograms.items()}
+        return counters, histograms
+
+    def dump(self):
+        """Write this process's series to the directory, replacing its previous file"""
+        if not self.directory:
+            return
+        self._write(os.path.join(self.directory, f'{os.getpid()}.json'), *self._snapshot())
+
+    @staticmethod
+    def _write(path, counters, histograms):
+        state = {'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+                 'histograms': [[name, labels, *series] for (name, labels), series in histograms.items()]}
+        with open(path + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def _merge(state, counters, histograms):
+        for name, labels, value in state['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, counts, total, count in state['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            series = histograms.get(key)
+            if series is None:
+                histograms[key] = (list(counts), total, count)
+            else:
+                histograms[key] = ([a + b for a, b in zip(series[0], counts)], series[1] + total, series[2] + count)
+
+    def _collect(self):
+        """Add up the series of every process, folding the files of exited ones into exited.json"""
+        self.dump()
+        counters, histograms = {}, {}
+        exited_counters, exited_histograms = {}, {}
+        exited_path = os.path.join(self.directory, 'exited.json')
+        with open(os.path.join(self.directory, 'LOCK'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            dead = []
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                try:
+                    with open(path) as f:
+                        state = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                self._merge(state, counters, histograms)
+                pid = os.path.basename(path)[:-len('.json')]
+                if path == exited_path or (pid.isdigit() and not _process_exists(int(pid))):
+                    self._merge(state, exited_counters, exited_histograms)
+                    if path != exited_path:
+                        dead.append(path)
+            if dead:
+                self._write(exited_path, exited_counters, exited_histograms)
+                for path in dead:
+                    os.remove(path)
+        return counters, histograms
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+    def render(self):
+        counters, histograms = self._collect() if self.directory else self._snapshot()
+        lines = []
+        for name, (kind, help_text, buckets) in self._meta.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                for (series_name, labels), value in counters.items():
+                    if series_name == name:
+                        lines.append(f"{name}{self._format_labels(labels)} {value}")
+                continue
+            for (series_name, labels), (counts, total, count) in histograms.items():
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{self._format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+metrics = Metrics(METRICS_DIR)
+atexit.register(metrics.dump)
+metrics.histogram('resume_stage_seconds', 'Time spent in each analysis stage',
+                  (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+metrics.counter('resume_stage_errors_total', 'Analysis stages that raised an exception')
+metrics.histogram('resume_pdf_pages', 'Pages per analyzed PDF', (1, 2, 3, 5, 10, 20, 50, 100))
+metrics.histogram('resume_text_chars', 'Characters of text extracted per resume',
+                  (1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000))
+metrics.counter('resume_requests_total', 'Analysis requests by endpoint and HTTP status')
+metrics.counter('resume_pdf_fallbacks_total', 'PDF pages whose text came from a fallback backend')
+metrics.counter('resume_analytics_rows_total', 'Analysis rows exported for analytics, or dropped')
+metrics.counter('resume_section_cache_total', 'Resume sections analyzed, by whether a cached result was reused')
+
+# Stage timings of the request being served, filled in by timed_stage
+_current_profile = ContextVar('current_profile', default=None)
+
+
+@contextmanager
+def timed_stage(name):
+    """Time a pipeline stage into the metrics and the current request's profile"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        metrics.inc('resume_stage_errors_total', stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe('resume_stage_seconds', elapsed, stage=name)
+        profile = _current_profile.get()
+        if profile is not None:
+            profile['stages_ms'][name] = profile['stages_ms'].get(name, 0) + round(elapsed * 1000, 3)
+
+
+def record_input_size(**sizes):
+    """Record page count or text size of the current input"""
+    for name, value in sizes.items():
+        metrics.observe(f'resume_{name}', value)
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.update(sizes)
+
+
+_private_directory = None
+_private_directory_lock = threading.Lock()
+
+
+def private_db_path(name):
+    """Path for a database of this process's own, in a temporary directory removed when it exits"""
+    global _private_directory
+    with _private_directory_lock:
+        if _private_directory is None:
+            _private_directory = tempfile.mkdtemp(prefix='resume_analyzer_')
+            atexit.register(_remove_private_directory, _private_directory, os.getpid())
+    return os.path.join(_private_directory, name)
+
+
+def _remove_private_directory(path, owner):
+    # Forked children run the parent's exit handlers too, but the directory is the parent's
+    if os.getpid() == owner:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class SQLiteConnections:
+    """Per-thread connections to one SQLite database, opened on first use and again in a forked process"""
+
+    def __init__(self, path, setup=None, timeout=10, name=None):
+        # Without a path the database is private to this process and its forks, created on first use
+        self._path = path
+        self._name = name
+        self.timeout = timeout
+        self._setup = setup
+        self._ready = False
+        self._setup_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = private_db_path(self._name)
+        return self._path
+
+    def get(self):
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.db, self._local.pid = db, os.getpid()
+            # Create the tables with the first connection rather than at import
+            if self._setup is not None and not self._ready:
+                with self._setup_lock:
+                    if not self._ready:
+                        self._setup(db)
+                        self._ready = True
+        return db
+
+
+class ResultCache:
+    """LRU cache of serialized analysis results, bounded by entries and bytes.
+
+    With a db_path, results are also written to SQLite so they survive
+    restarts and are shared between worker processes; entries found there
+    are promoted back into memory. The SQLite tier is bounded by age and
+    total size, and is read and written outside the in-memory cache lock so
+    disk I/O never holds up other threads' memory hits.
+    """
+
+    # Evict from the SQLite tier once every this many writes, so it may overshoot by that many results
+    DISK_EVICT_EVERY = 100
+
+    def __init__(self, max_entries, max_bytes, db_path=None, disk_max_bytes=RESULT_CACHE_DB_MAX_BYTES,
+                 disk_ttl=RESULT_CACHE_DB_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'disk_hits': 0, 'evictions': 0, 'disk_evictions': 0}
+        self.db_path = db_path
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_ttl = disk_ttl
+        self._db = SQLiteConnections(db_path, self._create_table, timeout=5) if db_path else None
+        self._writes = 0
+
+    @staticmethod
+    def _create_table(db):
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS results '
+                   '(key TEXT PRIMARY KEY, payload BLOB NOT NULL, stored_at REAL NOT NULL)')
+        # Databases written before the tier was bounded lack the size column
+        if 'size' not in {row[1] for row in db.execute('PRAGMA table_info(results)')}:
+            db.execute('ALTER TABLE results ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+            db.execute('UPDATE results SET size = length(payload)')
+        db.execute('CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)')
+
+    @staticmethod
+    def key(kind, data, taxonomy_version=None):
+        """Build a cache key from the content hash and the current table versions"""
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{ANALYSIS_VERSION}:{taxonomy_version or get_taxonomy().version}:{kind}:{digest}"
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return payload
+            if not self.db_path:
+                self._stats['misses'] += 1
+                return None
+
+        row = self._db.get().execute('SELECT payload FROM results WHERE key = ? AND stored_at >= ?',
+                                      (key, time.time() - self.disk_ttl)).fetchone()
+        with self._lock:
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            payload = bytes(row[0])
+            self._stats['hits'] += 1
+            self._stats['disk_hits'] += 1
+            self._store(key, payload)
+            return payload
+
+    def put(self, key, payload):
+        with self._lock:
+            self._store(key, payload)
+            if not self.db_path:
+                return
+            self._writes += 1
+            evict = self._writes % self.DISK_EVICT_EVERY == 0
+
+        db = self._db.get()
+        db.execute('INSERT OR REPLACE INTO results (key, payload, stored_at, size) VALUES (?, ?, ?, ?)',
+                   (key, payload, time.time(), len(payload)))
+        if evict:
+            self._evict_disk(db)
+
+    def _evict_disk(self, db):
+        """Drop expired results, then the oldest ones until the tier fits in disk_max_bytes"""
+        deleted = db.execute('DELETE FROM results WHERE stored_at < ?', (time.time() - self.disk_ttl,)).rowcount
+        if self.disk_max_bytes:
+            # Keep the newest results whose running total of sizes stays within the budget
+            deleted += db.execute(
+                'DELETE FROM results WHERE key IN (SELECT key FROM ('
+                'SELECT key, SUM(size) OVER (ORDER BY stored_at DESC, key) AS total FROM results'
+                ') WHERE total > ?)', (self.disk_max_bytes,)).rowcount
+        if deleted:
+            with self._lock:
+                self._stats['disk_evictions'] += deleted
+
+    def _store(self, key, payload):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[key] = payload
+        self._bytes += len(payload)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats,
+                         entries=len(self._entries),
+                         bytes=self._bytes,
+                         max_entries=self.max_entries,
+                         max_bytes=self.max_bytes,
+                         version=f"{ANALYSIS_VERSION}:{get_taxonomy().version}")
+        if self.db_path:
+            entries, size = self._db.get().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+            stats.update(disk_entries=entries, disk_bytes=size, disk_max_bytes=self.disk_max_bytes,
+                         disk_ttl=self.disk_ttl)
+        return stats
+
+
+result_cache = ResultCache(RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_DB)
+section_cache = ResultCache(SECTION_CACHE_MAX_ENTRIES, SECTION_CACHE_MAX_BYTES)
+analysis_history = ResultCache(ANALYSIS_HISTORY_MAX_ENTRIES, ANALYSIS_HISTORY_MAX_BYTES, ANALYSIS_HISTORY_DB)
+
+
+class CandidateIndex:
+    """Inverted index from skills to analyzed candidates, merged into a directory shared between processes"""
+
+    # Compacting a memory-only index waits for at least this many unused slots
+    MIN_COMPACT_SLOTS = 1024
+
+    def __init__(self, directory=None, autosave_every=0):
+        self.directory = directory
+        self.autosave_every = autosave_every
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._candidates = []
+        self._doc_ids = {}
+        self._deleted = bytearray()
+        self._skills = []
+        self._skill_ids = {}
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._base_postings = np.zeros(0, dtype=np.uint32)
+        self._delta = {}
+        # Changes since the last save, in order: candidate ID -> record, or None once removed.
+        # Only kept with a directory to save to
+        self._pending = OrderedDict()
+        self._snapshot = None
+        self._current_stat = None
+        self._unsaved = 0
+        if directory:
+            self.load()
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def add(self, candidate_id, results):
+        """Index an analyze_text result, replacing any earlier version of the candidate"""
+        skills = sorted(set(results['skills_analysis']['technical_skills'] +
+                            results['skills_analysis']['soft_skills']))
+        record = {
+            'candidate_id': candidate_id,
+            'word_count': results['word_count'],
+            'skills_score': results['skills_analysis']['skills_score'],
+            'sections': sorted(results['sections']),
+            'skills': skills
+        }
+        with self._lock:
+            doc_id = self._apply(candidate_id, record)
+            self._changed(candidate_id, record)
+        return doc_id
+
+    def remove(self, candidate_id):
+        self._refresh()
+        with self._lock:
+            if candidate_id not in self._doc_ids:
+                return False
+            self._apply(candidate_id, None)
+            self._changed(candidate_id, None)
+            return True
+
+    def _apply(self, candidate_id, record):
+        """Replace or remove one candidate in memory, returning its new doc ID"""
+        doc_id = self._doc_ids.pop(candidate_id, None)
+        if doc_id is not None:
+            self._deleted[doc_id] = 1
+            self._candidates[doc_id] = None
+        if record is None:
+            return None
+        doc_id = len(self._candidates)
+        self._candidates.append(record)
+        self._deleted.append(0)
+        self._doc_ids[candidate_id] = doc_id
+        for skill in record['skills']:
+            skill_id = self._skill_ids.get(skill)
+            if skill_id is None:
+                skill_id = self._skill_ids[skill] = len(self._skills)
+                self._skills.append(skill)
+            self._delta.setdefault(skill_id, array('I')).append(doc_id)
+        return doc_id
+
+    def _changed(self, candidate_id, record):
+        if not self.directory:
+            # Nothing to save, so drop the slots of replaced and removed candidates once they are the majority
+            if len(self._candidates) - len(self._doc_ids) > max(self.MIN_COMPACT_SLOTS, len(self._doc_ids)):
+                self._compact()
+            return
+        self._pending.pop(candidate_id, None)
+        self._pending[candidate_id] = record
+        self._unsaved += 1
+        if self.autosave_every and self._unsaved >= self.autosave_every:
+            self._unsaved = 0
+            threading.Thread(target=self.save, daemon=True).start()
+
+    def _compact(self):
+        """Renumber the in-memory candidates without the slots of replaced and removed ones"""
+        records = [record for record in self._candidates if record is not None]
+        self._candidates, self._deleted, self._doc_ids, self._delta = [], bytearray(), {}, {}
+        for record in records:
+            self._apply(record['candidate_id'], record)
+
+    def _postings(self, skill_id):
+        if skill_id + 1 < len(self._base_offsets):
+            yield self._base_postings[self._base_offsets[skill_id]:self._base_offsets[skill_id + 1]]
+        delta = self._delta.get(skill_id)
+        if delta:
+            yield np.frombuffer(delta, dtype=np.uint32)
+
+    def search(self, skills, top_k=10):
+        """Rank candidates by the weighted share of the requested skills they have.
+
+        skills is a list of skill names or a mapping of skill to weight, and
+        may use the taxonomy's aliases.
+        """
+        if not isinstance(skills, dict):
+            skills = dict.fromkeys(skills, 1.0)
+        canonical = get_taxonomy().matcher.canonical
+        required = {canonical(skill): float(weight) for skill, weight in skills.items()}
+        total_weight = sum(required.values())
+        if not required or total_weight <= 0:
+            return []
+
+        # Pick up other processes' saves in the background; this search uses the current copy
+        if self._snapshot_changed():
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+        with self._lock:
+            scores = np.zeros(len(self._candidates), dtype=np.float32)
+            for skill, weight in required.items():
+                skill_id = self._skill_ids.get(skill)
+                if skill_id is None:
+                    continue
+                for postings in self._postings(skill_id):
+                    # Doc IDs are unique within a postings list, so fancy-index add is safe
+                    scores[postings] += weight
+            scores[np.frombuffer(self._deleted, dtype=np.uint8).astype(bool)] = 0
+
+            matches = np.flatnonzero(scores)
+            if len(matches) > top_k:
+                matches = matches[np.argpartition(-scores[matches], top_k - 1)[:top_k]]
+            matches = matches[np.lexsort((matches, -scores[matches]))]
+
+            ranked = []
+            for doc_id in matches:
+                record = self._candidates[doc_id]
+                ranked.append({
+                    'candidate_id': record['candidate_id'],
+                    'match_percentage': round(float(scores[doc_id]) / total_weight * 100, 1),
+                    'matched_skills': [skill for skill in record['skills'] if skill in required],
+                    'missing_skills': [skill for skill in required if skill not in record['skills']],
+                    'skills_score': record['skills_score'],
+                    'word_count': record['word_count'],
+                    'sections': record['sections']
+                })
+            return ranked
+
+    def save(self):
+        """Merge this process's changes into the newest snapshot on disk and switch to the result"""
+        if not self.directory:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, OrderedDict()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(os.path.join(self.directory, 'LOCK'), 'w') as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    snapshot, candidates, skills = self._write_snapshot(
+                        self._read_snapshot(self._current_snapshot()), pending)
+                    stat = os.stat(os.path.join(self.directory, 'CURRENT'))
+                    with self._lock:
+                        self._load_snapshot(snapshot, candidates, skills, stat)
+            except Exception:
+                # Keep the changes for the next save, followed by any made since
+                with self._lock:
+                    for candidate_id, record in self._pending.items():
+                        pending.pop(candidate_id, None)
+                        pending[candidate_id] = record
+                    self._pending = pending
+                raise
+            logger.info(f"Saved candidate index with {len(self)} candidates to {snapshot}")
+
+    def _read_snapshot(self, snapshot):
+        """Return (candidates, skills, offsets, postings) of a snapshot, empty when there is none"""
+        if snapshot is None:
+            return [], [], np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint32)
+        with open(os.path.join(snapshot, 'skills.json')) as f:
+            skills = json.load(f)
+        with open(os.path.join(snapshot, 'candidates.jsonl')) as f:
+            candidates = [json.loads(line) for line in f]
+        return (candidates, skills, np.load(os.path.join(snapshot, 'offsets.npy'), mmap_mode='r'),
+                np.load(os.path.join(snapshot, 'postings.npy'), mmap_mode='r'))
+
+    def _write_snapshot(self, base, pending):
+        """Write base with the pending changes applied as a new snapshot and make it CURRENT.
+
+        Returns the snapshot path with its candidates and skills.
+        """
+        candidates, skills, base_offsets, base_postings = base
+
+        # Keep the base candidates that were not replaced or removed, renumbered without gaps
+        keep = np.fromiter((record is not None and record['candidate_id'] not in pending for record in candidates),
+                           dtype=bool, count=len(candidates))
+        renumbered = np.cumsum(keep) - 1
+        renumbered[~keep] = -1
+        merged = [record for record, kept in zip(candidates, keep) if kept]
+
+        skills = list(skills)
+        skill_ids = {skill: skill_id for skill_id, skill in enumerate(skills)}
+        added = {}
+        for record in pending.values():
+            if record is None:
+                continue
+            for skill in record['skills']:
+                skill_id = skill_ids.get(skill)
+                if skill_id is None:
+                    skill_id = skill_ids[skill] = len(skills)
+                    skills.append(skill)
+                added.setdefault(skill_id, []).append(len(merged))
+            merged.append(record)
+
+        # Renumbering keeps the base order and added candidates come last, so every list stays sorted
+        offsets = [0]
+        chunks = []
+        for skill_id in range(len(skills)):
+            parts = []
+            if skill_id + 1 < len(base_offsets):
+                kept = renumbered[base_postings[base_offsets[skill_id]:base_offsets[skill_id + 1]]]
+                parts.append(kept[kept >= 0])
+            if skill_id in added:
+                parts.append(np.asarray(added[skill_id], dtype=np.int64))
+            postings = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+            chunks.append(postings)
+            offsets.append(offsets[-1] + len(postings))
+        postings = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+        snapshot = os.path.join(self.directory, f"snapshot-{time.time_ns()}")
+        os.makedirs(snapshot)
+        np.save(os.path.join(snapshot, 'postings.npy'), postings.astype(np.uint32))
+        np.save(os.path.join(snapshot, 'offsets.npy'), np.asarray(offsets, dtype=np.int64))
+        with open(os.path.join(snapshot, 'skills.json'), 'w') as f:
+            json.dump(skills, f)
+        with open(os.path.join(snapshot, 'candidates.jsonl'), 'w') as f:
+            for record in merged:
+                f.write(json.dumps(record) + '\n')
+
+        current = os.path.join(self.directory, 'CURRENT')
+        previous = self._current_snapshot()
+        with open(current + '.tmp', 'w') as f:
+            f.write(os.path.basename(snapshot))
+        os.replace(current + '.tmp', current)
+
+        # Keep the previous snapshot for processes that are still loading it
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('snapshot-') and path not in (snapshot, previous):
+                shutil.rmtree(path, ignore_errors=True)
+        return snapshot, merged, skills
+
+    def _current_snapshot(self):
+        try:
+            with open(os.path.join(self.directory, 'CURRENT')) as f:
+                return os.path.join(self.directory, f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def _snapshot_changed(self):
+        if not self.directory:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.directory, 'CURRENT'))
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns) != self._current_stat
+
+    def _load_snapshot(self, snapshot, candidates, skills, stat):
+        """Make snapshot the base, memory-mapping its postings, and replay the unsaved changes on top"""
+        self._base_postings = np.load(os.path.join(snapshot, 'postings.npy'), mmap_mode='r')
+        self._base_offsets = np.load(os.path.join(snapshot, 'offsets.npy'), mmap_mode='r')
+        self._skills = list(skills)
+        self._skill_ids = {skill: skill_id for skill_id, skill in enumerate(skills)}
+        self._candidates = list(candidates)
+        # Snapshots written before saves renumbered candidates hold null lines for removed ones
+        self._deleted = bytearray(record is None for record in candidates)
+        self._doc_ids = {record['candidate_id']: doc_id for doc_id, record in enumerate(candidates)
+                         if record is not None}
+        self._delta = {}
+        for candidate_id, record in self._pending.items():
+            self._apply(candidate_id, record)
+        self._snapshot = snapshot
+        self._current_stat = (stat.st_ino, stat.st_mtime_ns)
+
+    def _refresh(self):
+        """Switch to a snapshot another process saved since this one was loaded"""
+        if not self._snapshot_changed() or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            with self._save_lock:
+                if self._current_snapshot() != self._snapshot:
+                    self.load()
+        except FileNotFoundError:
+            # Replaced again while loading; the next search retries
+            pass
+        finally:
+            self._refresh_lock.release()
+
+    def load(self):
+        """Load the latest snapshot"""
+        try:
+            stat = os.stat(os.path.join(self.directory, 'CURRENT'))
+        except FileNotFoundError:
+            return
+        snapshot = self._current_snapshot()
+        candidates, skills, _, _ = self._read_snapshot(snapshot)
+        with self._lock:
+            self._load_snapshot(snapshot, candidates, skills, stat)
+        logger.info(f"Loaded candidate index with {len(self)} candidates from {snapshot}")
+
+
+candidate_index = CandidateIndex(CANDIDATE_INDEX_DIR, CANDIDATE_INDEX_AUTOSAVE)
+atexit.register(candidate_index.save)
+
+
+class AnalyticsExporter:
+    """Appends one row per analysis to rolling Parquet files from a background thread.
+
+    record() only puts the row on a bounded queue, dropping it when the queue
+    is full, so exporting never holds up a request. The writer thread writes
+    the rows in row groups and rolls over to a new file by size or age. Open
+    files carry a .part suffix and are renamed when closed, so readers only
+    ever see complete files.
+    """
+
+    _STOP = object()
+
+    def __init__(self, directory, max_pending, batch_rows, flush_seconds, roll_bytes, roll_seconds):
+        self.directory = directory
+        self.max_pending = max_pending
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.roll_bytes = roll_bytes
+        self.roll_seconds = roll_seconds
+        self._schema = None
+        self._sequence = 0
+        self.reset_after_fork()
+
+    def reset_after_fork(self):
+        """Forget the queue and writer thread, which a forked child does not inherit"""
+        self._lock = threading.Lock()
+        self._queue = Queue(self.max_pending)
+        self._thread = None
+        self._writer = None
+        self._path = None
+        self._opened = None
+
+    def record(self, row):
+        if not self.directory or not self._start():
+            return
+        try:
+            self._queue.put_nowait(row)
+        except Full:
+            metrics.inc('resume_analytics_rows_total', result='dropped')
+
+    def _start(self):
+        if self._thread is not None:
+            return True
+        with self._lock:
+            if self._thread is None:
+                pyarrow = get_component('pyarrow')
+                if pyarrow is None:
+                    logger.warning('pyarrow is not available, analytics export is disabled')
+                    self.directory = None
+                    return False
+                os.makedirs(self.directory, exist_ok=True)
+                self._schema = pyarrow.schema([
+                    ('timestamp', pyarrow.timestamp('ms', tz='UTC')),
+                    ('source', pyarrow.string()),
+                    ('analysis_id', pyarrow.string()),
+                    ('analysis_version', pyarrow.int32()),
+                    ('taxonomy_version', pyarrow.string()),
+                    ('cache', pyarrow.string()),
+                    ('pdf_pages', pyarrow.int32()),
+                    ('text_chars', pyarrow.int64()),
+                    ('word_count', pyarrow.int32()),
+                    ('polarity', pyarrow.float64()),
+                    ('subjectivity', pyarrow.float64()),
+                    ('skills_score', pyarrow.float64()),
+                    ('technical_skills', pyarrow.list_(pyarrow.string())),
+                    ('soft_skills', pyarrow.list_(pyarrow.string())),
+                    ('sections', pyarrow.list_(pyarrow.string())),
+                    ('matched_roles', pyarrow.list_(pyarrow.string())),
+                    ('role_match_percentages', pyarrow.list_(pyarrow.float64())),
+                    ('stages_ms', pyarrow.map_(pyarrow.string(), pyarrow.float64()))
+                ])
+                self._thread = threading.Thread(target=self._run, name='analytics-exporter', daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        rows, flush_at, stopping = [], None, False
+        while not stopping:
+            deadlines = [deadline for deadline in (flush_at, self._opened and self._opened + self.roll_seconds)
+                         if deadline]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            try:
+                row = self._queue.get(timeout=timeout)
+            except Empty:
+                row = None
+            if row is self._STOP:
+                stopping = True
+            elif row is not None:
+                rows.append(row)
+                flush_at = flush_at or time.monotonic() + self.flush_seconds
+                if len(rows) < self.batch_rows and time.monotonic() < flush_at:
+                    continue
+            if rows:
+                self._write(rows)
+                rows, flush_at = [], None
+            if self._writer is not None and (stopping or time.monotonic() - self._opened >= self.roll_seconds
+                                             or os.path.getsize(self._path) >= self.roll_bytes):
+                self._close_file()
+
+    def _write(self, rows):
+        pyarrow = get_component('pyarrow')
+        try:
+            table = pyarrow.Table.from_pylist(rows, schema=self._schema)
+            if self._writer is None:
+                self._open_file(pyarrow)
+            self._writer.write_table(table)
+        except Exception as e:
+            logger.error(f"Could not export {len(rows)} analytics rows: {str(e)}")
+            metrics.inc('resume_analytics_rows_total', len(rows), result='dropped')
+            return
+        metrics.inc('resume_analytics_rows_total', len(rows), result='written')
+
+    def _open_file(self, pyarrow):
+        self._sequence += 1
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self._path = os.path.join(self.directory, f"analyses-{stamp}-{os.getpid()}-{self._sequence}.parquet.part")
+        self._writer = pyarrow.parquet.ParquetWriter(self._path, self._schema, compression='zstd')
+        self._opened = time.monotonic()
+
+    def _close_file(self):
+        try:
+            self._writer.close()
+            os.replace(self._path, self._path[:-len('.part')])
+        except Exception as e:
+            logger.error(f"Could not finish analytics file {self._path}: {str(e)}")
+        self._writer, self._path, self._opened = None, None, None
+
+    def close(self, timeout=10):
+        """Write out the queued rows and finish the current file"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except Full:
+            logger.warning('Analytics export queue did not drain, dropping the queued rows')
+            return
+        thread.join(timeout)
+
+
+def analytics_row(results, source, analysis_id=None, profile=None):
+    """Flatten an analyze_text result and the request profile into one export row"""
+    profile = profile or {}
+    skills = results['skills_analysis']
+    scores = results['sentiment_analysis']['raw_scores']
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc),
+        'source': source,
+        'analysis_id': analysis_id,
+        'analysis_version': ANALYSIS_VERSION,
+        'taxonomy_version': get_taxonomy().version,
+        'cache': profile.get('cache'),
+        'pdf_pages': profile.get('pdf_pages'),
+        'text_chars': profile.get('text_chars'),
+        'word_count': results['word_count'],
+        'polarity': scores['polarity'],
+        'subjectivity': scores['subjectivity'],
+        'skills_score': skills['skills_score'],
+        'technical_skills': skills['technical_skills'],
+        'soft_skills': skills['soft_skills'],
+        'sections': list(results['sections']),
+        'matched_roles': [job['role'] for job in results['job_recommendations']],
+        'role_match_percentages': [job['match_percentage'] for job in results['job_recommendations']],
+        'stages_ms': list(profile.get('stages_ms', {}).items())
+    }
+
+
+analytics_exporter = AnalyticsExporter(ANALYTICS_DIR, ANALYTICS_MAX_PENDING, ANALYTICS_BATCH_ROWS,
+                                       ANALYTICS_FLUSH_SECONDS, ANALYTICS_ROLL_BYTES, ANALYTICS_ROLL_SECONDS)
+atexit.register(analytics_exporter.close)
+
+# Terms of at least two characters, keeping tokens like c++, c#, node.js and ci/cd whole
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]")
+_STOP_TERMS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or',
+    'our', 'the', 'to', 'we', 'will', 'with', 'you', 'your', 'this', 'that', 'have', 'has', 'who', 'all'
+))
+
+
+def iter_terms(lowered):
+    """Yield the indexable terms of lowered text"""
+    for match in _TERM_RE.finditer(lowered):
+        term = match.group()
+        if term not in _STOP_TERMS:
+            yield term
+
+
+class JobDescription:
+    """A job description parsed once into skill weights and query terms"""
+
+    def __init__(self, jd_id, title, text, taxonomy):
+        self.id = jd_id
+        self.title = title
+        self.text = text
+        self.taxonomy_version = taxonomy.version
+
+        lowered = lower_preserving_offsets(text)
+        self.sections = [span.name for span in segment_sections(text, lowered)]
+        counts = {}
+        for match in taxonomy.matcher.scan(text, lowered):
+            counts[match.skill] = counts.get(match.skill, 0) + 1
+        # Sublinear term frequency, so a skill repeated throughout the posting counts more but not linearly
+        self.skills = sorted(counts, key=counts.get, reverse=True)
+        self.skill_weights = np.array([1 + np.log(counts[skill]) for skill in self.skills])
+        self.skill_index = {skill: col for col, skill in enumerate(self.skills)}
+
+        term_counts = {}
+        for term in iter_terms(lowered):
+            term_counts[term] = term_counts.get(term, 0) + 1
+        self.terms = list(term_counts)
+        self.term_index = {term: col for col, term in enumerate(self.terms)}
+        self.term_weights = 1 + np.log(np.array(list(term_counts.values()), dtype=float))
+
+    def describe(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'skills': self.skills,
+            'sections': self.sections,
+            'terms': len(self.terms),
+            'taxonomy_version': self.taxonomy_version
+        }
+
+
+class JobDescriptionIndex:
+    """Job descriptions stored in SQLite, scored against resumes by skill coverage and BM25 text relevance"""
+
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    def __init__(self, path, max_entries):
+        self.max_entries = max_entries
+        # Parsed JDs by ID as (revision, JobDescription), least recently used first
+        self._entries = OrderedDict()
+        # The revision of every stored JD and the document frequency of their terms, as of _generation
+        self._revisions = {}
+        self._document_frequency = {}
+        self._generation = None
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(path, self._create_tables, name='job_descriptions.sqlite3')
+
+    @property
+    def path(self):
+        return self._db.path
+
+    @staticmethod
+    def _create_tables(db):
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS job_descriptions ('
+                   'id TEXT PRIMARY KEY, title TEXT, text TEXT NOT NULL, terms TEXT NOT NULL, '
+                   'revision INTEGER NOT NULL, added REAL NOT NULL)')
+        db.execute('CREATE INDEX IF NOT EXISTS job_descriptions_added ON job_descriptions (added)')
+        # Bumped by every add and remove, so other processes know to refresh their term statistics
+        db.execute('CREATE TABLE IF NOT EXISTS job_description_generation (generation INTEGER NOT NULL)')
+        if db.execute('SELECT COUNT(*) FROM job_description_generation').fetchone()[0] == 0:
+            db.execute('INSERT INTO job_description_generation VALUES (0)')
+
+    def __len__(self):
+        self._sync()
+        return len(self._revisions)
+
+    def add(self, text, jd_id=None, title=None):
+        """Parse and store a job description, replacing any with the same ID"""
+        jd_id = jd_id or hashlib.sha256(text.encode()).hexdigest()[:16]
+        jd = JobDescription(jd_id, title, text, get_taxonomy())
+        db = self._db.get()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            revision = self._bump(db)
+            db.execute('INSERT OR REPLACE INTO job_descriptions (id, title, text, terms, revision, added) '
+                       'VALUES (?, ?, ?, ?, ?, ?)', (jd_id, title, text, json.dumps(jd.terms), revision, time.time()))
+            # Keep the most recently added max_entries
+            db.execute('DELETE FROM job_descriptions WHERE id NOT IN '
+                       '(SELECT id FROM job_descriptions ORDER BY added DESC LIMIT ?)', (self.max_entries,))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        self._cache(jd, revision)
+        return jd
+
+    def get(self, jd_id):
+        """Return a stored JD, parsing it first if this process hasn't yet or the taxonomy changed since"""
+        self._sync()
+        with self._lock:
+            revision = self._revisions.get(jd_id)
+            cached = self._entries.get(jd_id)
+            if revision is None:
+                return None
+            if cached is not None:
+                self._entries.move_to_end(jd_id)
+        if cached is not None and cached[0] == revision and cached[1].taxonomy_version == get_taxonomy().version:
+            return cached[1]
+        row = self._db.get().execute('SELECT title, text, revision FROM job_descriptions WHERE id = ?',
+                                      (jd_id,)).fetchone()
+        if row is None:
+            return None
+        title, text, revision = row
+        jd = JobDescription(jd_id, title, text, get_taxonomy())
+        self._cache(jd, revision)
+        return jd
+
+    def remove(self, jd_id):
+        db = self._db.get()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            removed = db.execute('DELETE FROM job_descriptions WHERE id = ?', (jd_id,)).rowcount > 0
+            if removed:
+                self._bump(db)
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        if removed:
+            with self._lock:
+                self._entries.pop(jd_id, None)
+        return removed
+
+    def _bump(self, db):
+        db.execute('UPDATE job_description_generation SET generation = generation + 1')
+        return db.execute('SELECT generation FROM job_description_generation').fetchone()[0]
+
+    def _cache(self, jd, revision):
+        with self._lock:
+            self._entries[jd.id] = (revision, jd)
+            self._entries.move_to_end(jd.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _sync(self):
+        """Reload the revisions and term statistics if the store changed since they were read"""
+        db = self._db.get()
+        generation = db.execute('SELECT generation FROM job_description_generation').fetchone()[0]
+        if generation == self._generation:
+            return
+        db.execute('BEGIN')
+        try:
+            generation = db.execute('SELECT generation FROM job_description_generation').fetchone()[0]
+            rows = db.execute('SELECT id, revision, terms FROM job_descriptions').fetchall()
+        finally:
+            db.execute('COMMIT')
+        revisions, frequency = {}, {}
+        for jd_id, revision, terms in rows:
+            revisions[jd_id] = revision
+            for term in json.loads(terms):
+                frequency[term] = frequency.get(term, 0) + 1
+        with self._lock:
+            # Another thread may have loaded a newer generation meanwhile
+            if self._generation is not None and generation < self._generation:
+                return
+            self._generation, self._revisions, self._document_frequency = generation, revisions, frequency
+            for jd_id in [jd_id for jd_id, (revision, _) in self._entries.items() if revisions.get(jd_id) != revision]:
+                del self._entries[jd_id]
+
+    def idf(self, jd):
+        """Smoothed IDF of the JD's terms across the stored JDs"""
+        self._sync()
+        with self._lock:
+            total = len(self._revisions)
+            frequency = np.array([self._document_frequency.get(term, 0) for term in jd.terms], dtype=float)
+        return np.log((1 + total) / (1 + frequency)) + 1
+
+    def score(self, jd, resumes):
+        """Score (lowered text, skills) resumes against jd, returning a record per resume"""
+        if not resumes:
+            return []
+        taxonomy = get_taxonomy()
+
+        # Resume x JD skill and resume x JD term count matrices
+        has_skill = np.zeros((len(resumes), len(jd.skills)))
+        term_counts = np.zeros((len(resumes), len(jd.terms)))
+        lengths = np.zeros(len(resumes))
+        for row, (lowered, skills) in enumerate(resumes):
+            for skill in skills:
+                col = jd.skill_index.get(taxonomy.matcher.canonical(skill))
+                if col is not None:
+                    has_skill[row, col] = 1
+            columns = [jd.term_index.get(term, -1) for term in iter_terms(lowered)]
+            lengths[row] = len(columns)
+            columns = np.array(columns, dtype=np.intp)
+            term_counts[row] = np.bincount(columns[columns >= 0], minlength=len(jd.terms))
+
+        skill_total = jd.skill_weights.sum()
+        skill_scores = has_skill @ jd.skill_weights / skill_total * 100 if skill_total else np.zeros(len(resumes))
+
+        # IDF comes from the stored JDs rather than the resumes on purpose: the terms every posting
+        # shares count for less, and a single resume still gets term weights. With one JD stored
+        # every IDF is 1 and relevance comes down to the saturated JD-weighted term counts. Length
+        # normalization is against the average resume of the batch being scored
+        query_weights = jd.term_weights * self.idf(jd)
+        k1, b = self.BM25_K1, self.BM25_B
+        average_length = lengths.mean() or 1.0
+        norm = k1 * (1 - b + b * lengths / average_length)
+        saturated = term_counts * (k1 + 1) / (term_counts + norm[:, None])
+        best = query_weights.sum() * (k1 + 1)
+        text_scores = saturated @ query_weights / best * 100 if best else np.zeros(len(resumes))
+
+        # With no skills in the JD the text relevance is all there is to go on
+        skill_share = JD_SKILL_WEIGHT if jd.skills else 0.0
+        scores = skill_share * skill_scores + (1 - skill_share) * text_scores
+
+        records = []
+        for row in range(len(resumes)):
+            matched = has_skill[row].astype(bool)
+            records.append({
+                'score': round(float(scores[row]), 1),
+                'skill_score': round(float(skill_scores[row]), 1),
+                'text_score': round(float(text_scores[row]), 1),
+                'matched_skills': [skill for skill, hit in zip(jd.skills, matched) if hit],
+                'missing_skills': [skill for skill, hit in zip(jd.skills, matched) if not hit]
+            })
+        return records
+
+
+job_description_index = JobDescriptionIndex(JD_INDEX_DB, JD_INDEX_MAX_ENTRIES)
+
+
+@api.route('/')
 def home():
     return render_template_string(TEMPLATES)
 
 
-@app.route('/analyze_resume', methods=['POST'])
+@api.route('/analyze_resume', methods=['POST'])
 def analyze_resume():
+    # Stage timings are always collected; ?profile=1 adds them to the response
+    profile = {'stages_ms': {}}
+    token = _current_profile.set(profile)
+    try:
+        response = current_app.make_response(_analyze_resume(profile))
+    finally:
+        _current_profile.reset(token)
+    metrics.inc('resume_requests_total', endpoint='analyze_resume', status=response.status_code)
+    return response
+
+
+def _analyze_resume(profile):
     try:
         file = request.files['resume']
         if not file.filename.endswith('.pdf'):
             return jsonify({'error': 'Only PDF files are allowed'}), 400
-        
-        # Process the resume as needed
-        # Assume extract_text_from_pdf and analyze_text are already defined to process the resume
-        filepath = "temp_resume.pdf"
-        file.save(filepath)
-        text = extract_text_from_pdf(filepath)
-        results = analyze_text(text)
-
-        return jsonify(results)
 
+        # ?max_bullets=N keeps only the first N bullets of each section, for summary views
+        max_bullets = request.args.get('max_bullets')
+        if max_bullets is not None:
+            if not max_bullets.isdigit() or int(max_bullets) < 1:
+                return jsonify({'error': 'max_bullets must be a positive integer'}), 400
+            max_bullets = int(max_bullets)
+
+        # Parse straight from the upload buffer; nothing is written to a shared path
+        data = file.stream.read()
+
+        if request.args.get('async') == '1':
+            try:
+                job_id = job_queue.enqueue(file.filename, data)
+            except QueueFull as e:
+                response = jsonify({'error': str(e)})
+                response.headers['Retry-After'] = '5'
+                return response, 503
+            start_job_workers()
+            return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/jobs/{job_id}'}), 202
+
+        # Find the analysis to diff against first, so an unknown ID fails before any work is done
+        previous_id = request.form.get('previous_id') or request.args.get('previous_id')
+        previous = analysis_history.get(previous_id) if previous_id else None
+        if previous_id and previous is None:
+            return jsonify({'error': f"No analysis with ID {previous_id}, it may have expired"}), 404
+
+        payload, results = analyze_pdf_bytes(data, max_bullets)
+        if results is None:
+            results = json.loads(payload)
+
+        # Keep the analysis searchable for reverse search by job skills
+        analysis_id = hashlib.sha256(data).hexdigest()[:16]
+        candidate_id = request.form.get('candidate_id') or analysis_id
+        candidate_index.add(candidate_id, results)
+
+        # Keep it by ID too, so a later version of the resume can be diffed against it
+        fields = {'analysis_id': analysis_id}
+        if previous is not None:
+            fields['diff'] = diff_analyses(json.loads(previous), results)
+        analysis_history.put(analysis_id, payload)
+        if analytics_exporter.directory:
+            analytics_exporter.record(analytics_row(results, 'analyze_resume', analysis_id, profile))
+
+        if request.args.get('profile') == '1':
+            body = dict(results, profile=profile, **fields)
+            payload = current_app.json.dumps(body).encode()
+        else:
+            # The cached payload is shared by every upload of this text, so add the fields without reparsing it
+            payload = b'{' + current_app.json.dumps(fields)[1:-1].encode() + b', ' + payload[1:]
+
+        response = current_app.response_class(payload, mimetype='application/json')
+        response.headers['X-Candidate-Id'] = candidate_id
+        return response
+
+    except RequestEntityTooLarge:
+        raise
+    except DocumentRejected as e:
+        logger.warning(f"Rejected resume {file.filename}: {str(e)}")
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
+        logger.error(f"Error analyzing resume: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def extract_text_from_pdf(filepath):
+def analyze_pdf_bytes(data, max_bullets=None):
+    """Analyze an uploaded PDF through the result cache.
+
+    Returns the serialized result, plus the result dict when it was computed
+    rather than read from the cache. Identical uploads are served from the
+    cache, and different PDFs with the same extracted text share an analysis.
+    """
+    profile = _current_profile.get() or {}
+    results = None
+    variant = f":{max_bullets}" if max_bullets else ''
+
+    # Key and analyze against one taxonomy, even if a reload lands meanwhile
+    taxonomy = get_taxonomy()
+    upload_key = result_cache.key('upload' + variant, data, taxonomy.version)
+    payload = result_cache.get(upload_key)
+    profile['cache'] = 'upload'
+    if payload is None:
+        text = extract_text_from_pdf(data)
+        text_key = result_cache.key('text' + variant, text.encode(), taxonomy.version)
+        payload = result_cache.get(text_key)
+        profile['cache'] = 'text'
+        if payload is None:
+            results = analyze_text(text, taxonomy, max_bullets)
+            with timed_stage('serialize'):
+                payload = app.json.dumps(results).encode()
+            result_cache.put(text_key, payload)
+            profile['cache'] = 'miss'
+        result_cache.put(upload_key, payload)
+    return payload, results
+
+
+class QueueFull(Exception):
+    """Raised when JOB_QUEUE_MAX_PENDING jobs are already waiting or running"""
+
+
+class JobQueue:
+    """SQLite-backed queue of analysis jobs shared by web and worker processes"""
+
+    def __init__(self, path, max_pending):
+        self.max_pending = max_pending
+        self._db = SQLiteConnections(path, self._create_tables, name='jobs.sqlite3')
+
+    @property
+    def path(self):
+        return self._db.path
+
+    @staticmethod
+    def _create_tables(db):
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS jobs ('
+                   'id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT, payload BLOB, '
+                   'result BLOB, error TEXT, created REAL NOT NULL, started REAL, finished REAL)')
+        db.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)')
+        # The PID of the worker running each job, so a worker stuck past JOB_TIMEOUT can be killed
+        if 'worker' not in {row[1] for row in db.execute('PRAGMA table_info(jobs)')}:
+            db.execute('ALTER TABLE jobs ADD COLUMN worker INTEGER')
+
+    def enqueue(self, filename, data):
+        db = self._db.get()
+        self._expire(db)
+        job_id = uuid.uuid4().hex
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            pending = db.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+            if pending >= self.max_pending:
+                raise QueueFull(f"{pending} jobs are already pending, try again later")
+            db.execute("INSERT INTO jobs (id, status, filename, payload, created) VALUES (?, 'queued', ?, ?, ?)",
+                       (job_id, filename, data, time.time()))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def claim(self):
+        """Mark the oldest queued job as running and return (id, filename, payload)"""
+        db = self._db.get()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            job = db.execute("SELECT id, filename, payload FROM jobs WHERE status = 'queued' "
+                             "ORDER BY created LIMIT 1").fetchone()
+            if job is not None:
+                db.execute("UPDATE jobs SET status = 'running', started = ?, worker = ? WHERE id = ?",
+                           (time.time(), os.getpid(), job[0]))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return job
+
+    def complete(self, job_id, result):
+        self._db.get().execute("UPDATE jobs SET status = 'done', result = ?, payload = NULL, finished = ? "
+                                "WHERE id = ?", (result, time.time(), job_id))
+
+    def fail(self, job_id, error):
+        self._db.get().execute("UPDATE jobs SET status = 'failed', error = ?, payload = NULL, finished = ? "
+                                "WHERE id = ?", (error, time.time(), job_id))
+
+    def get(self, job_id):
+        row = self._db.get().execute('SELECT id, status, filename, result, error, created, started, finished '
+                                      'FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {'job_id': row[0], 'status': row[1], 'filename': row[2],
+               'created': row[5], 'started': row[6], 'finished': row[7]}
+        if row[3] is not None:
+            job['result'] = json.loads(row[3])
+        if row[4] is not None:
+            job['error'] = row[4]
+        return job
+
+    def expire(self):
+        self._expire(self._db.get())
+
+    def _expire(self, db):
+        """Fail jobs running past JOB_TIMEOUT, killing their workers, and drop old finished jobs"""
+        now = time.time()
+        stuck = db.execute("SELECT DISTINCT worker FROM jobs WHERE status = 'running' AND started < ?",
+                           (now - JOB_TIMEOUT,)).fetchall()
+        if stuck:
+            # Only kill processes that hold a worker slot, never whatever reused a dead worker's PID
+            workers = job_worker_pids(self.path)
+            for (pid,) in stuck:
+                if pid in workers and pid != os.getpid():
+                    logger.warning(f"Killing job worker {pid}: its job ran past {JOB_TIMEOUT}s")
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+        db.execute("UPDATE jobs SET status = 'failed', error = 'Job timed out', payload = NULL, finished = ? "
+                   "WHERE status = 'running' AND started < ?", (now, now - JOB_TIMEOUT))
+        db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished < ?", (now - JOB_RESULT_TTL,))
+
+
+def _job_worker_slot(path, slot):
+    return f"{path}.worker{slot}"
+
+
+def claim_job_worker_slot(path):
+    """Lock one of the JOB_WORKERS slot files for the life of this process; None when all are taken.
+
+    The slots cap the job workers across every process sharing the queue,
+    and the kernel releases a slot when its worker dies.
+    """
+    for slot in range(JOB_WORKERS):
+        slot_file = open(_job_worker_slot(path, slot), 'a+')
+        try:
+            fcntl.flock(slot_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            slot_file.close()
+            continue
+        slot_file.seek(0)
+        slot_file.truncate()
+        slot_file.write(str(os.getpid()))
+        slot_file.flush()
+        return slot_file
+    return None
+
+
+def job_worker_pids(path):
+    """Return the PIDs of the job workers currently holding a slot"""
+    pids = set()
+    for slot in range(JOB_WORKERS):
+        try:
+            slot_file = open(_job_worker_slot(path, slot))
+        except FileNotFoundError:
+            continue
+        with slot_file:
+            try:
+                fcntl.flock(slot_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                content = slot_file.read().strip()
+                if content.isdigit():
+                    pids.add(int(content))
+            else:
+                fcntl.flock(slot_file, fcntl.LOCK_UN)
+    return pids
+
+
+def run_job_worker(queue, exit_with_parent=False):
+    """Drain the job queue, analyzing one PDF at a time, for as long as this process holds a worker slot"""
+    slot = claim_job_worker_slot(queue.path)
+    if slot is None:
+        logger.info(f"All {JOB_WORKERS} job worker slots for {queue.path} are taken")
+        return
+    # Workers may be started from a process that already opened the caches and pools
+    reset_after_fork()
+    # A job worker is a process of its own that is killed once its job outlives JOB_TIMEOUT, so it
+    # extracts in place under the sandbox limits rather than keeping a sandbox pool
+    global _sandboxed
+    _sandboxed = True
+    warm_up()
+    _limit_memory()
+    parent = os.getppid()
+    logger.info(f"Job worker {os.getpid()} polling {queue.path}")
+    next_expiry = 0
+    while True:
+        if exit_with_parent and os.getppid() != parent:
+            logger.info(f"Job worker {os.getpid()} exiting with its parent")
+            return
+        # Any live worker also fails stuck jobs and kills the workers running them
+        if time.monotonic() >= next_expiry:
+            queue.expire()
+            next_expiry = time.monotonic() + 5
+        job = queue.claim()
+        if job is None:
+            time.sleep(JOB_POLL_INTERVAL)
+            continue
+        job_id, filename, data = job
+        _limit_cpu()
+        try:
+            payload, _ = analyze_pdf_bytes(data)
+            queue.complete(job_id, payload)
+        except Exception as e:
+            logger.error(f"Job {job_id} ({filename}) failed: {str(e)}")
+            queue.fail(job_id, str(e))
+
+
+job_queue = JobQueue(JOB_QUEUE_DB, JOB_QUEUE_MAX_PENDING)
+
+_job_workers = []
+_job_workers_lock = threading.Lock()
+
+
+def start_job_workers():
+    """Start worker processes for the free job worker slots, after killing workers whose jobs are stuck.
+
+    Workers run as fresh 'app.py --job-worker' interpreters rather than
+    forks of this threaded process, and exit when the process that started
+    them does.
+    """
+    if not JOB_WORKERS_AUTOSTART:
+        return
+    job_queue.expire()
+    with _job_workers_lock:
+        _job_workers[:] = [worker for worker in _job_workers if worker.poll() is None]
+        running = job_worker_pids(job_queue.path)
+        # Workers started here that have not claimed their slot yet count against the free ones
+        starting = sum(1 for worker in _job_workers if worker.pid not in running)
+        for _ in range(JOB_WORKERS - len(running) - starting):
+            _job_workers.append(subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), '--job-worker', '--exit-with-parent'],
+                env=dict(os.environ, JOB_QUEUE_DB=job_queue.path)))
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Return the shared process pool, creating it on first use"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ProcessPoolExecutor(max_workers=WORKER_PROCESSES,
+                                               mp_context=multiprocessing.get_context(WORKER_START_METHOD))
+        return _worker_pool
+
+
+def reset_worker_pool():
+    """Drop a broken process pool so the next caller starts a fresh one"""
+    global _worker_pool
+    with _worker_pool_lock:
+        pool, _worker_pool = _worker_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class SandboxPool:
+    """Pre-started processes that each run one PDF extraction at a time under CPU and memory limits"""
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(WORKER_START_METHOD)
+        self._idle = Queue()
+        for _ in range(size):
+            self._idle.put(self._start())
+        # Threads that wait on the processes, so submit hands out futures like an executor
+        self._dispatch = ThreadPoolExecutor(max_workers=size, thread_name_prefix='sandbox')
+
+    def _start(self):
+        connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_run_sandbox_worker, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        return process, connection
+
+    @staticmethod
+    def _stop(process, connection):
+        connection.close()
+        process.kill()
+        process.join()
+
+    def run(self, function, *args):
+        """Run function(*args) in a sandbox process and return its result"""
+        process, connection = self._idle.get()
+        if not process.is_alive():
+            self._stop(process, connection)
+            process, connection = self._start()
+        # Any outcome but a reply leaves the process in an unknown state, so it is replaced
+        retire = True
+        try:
+            try:
+                connection.send((function, args))
+                if not connection.poll(self.timeout):
+                    raise DocumentRejected(f"PDF extraction took longer than {self.timeout}s")
+                status, value, retire = connection.recv()
+            except (EOFError, OSError):
+                raise DocumentRejected('PDF extraction exceeded its CPU or memory limit')
+        finally:
+            if retire:
+                self._stop(process, connection)
+                process, connection = self._start()
+            self._idle.put((process, connection))
+        if status == 'rejected':
+            raise DocumentRejected(value)
+        if status == 'error':
+            raise RuntimeError(value)
+        return value
+
+    def submit(self, function, *args):
+        return self._dispatch.submit(self.run, function, *args)
+
+    def close(self):
+        self._dispatch.shutdown(wait=False, cancel_futures=True)
+        for _ in range(self.size):
+            self._stop(*self._idle.get())
+
+
+_sandbox_pool = None
+# True inside sandbox and job worker processes, where extraction runs in place
+_sandboxed = False
+
+
+def get_sandbox_pool():
+    """Return the extraction sandbox pool, starting its processes on first use"""
+    global _sandbox_pool
+    with _worker_pool_lock:
+        if _sandbox_pool is None:
+            _sandbox_pool = SandboxPool(EXTRACTION_SANDBOX_PROCESSES, EXTRACTION_TIMEOUT)
+        return _sandbox_pool
+
+
+def _limit_memory():
+    """Cap the address space of the current process at what it maps now plus EXTRACTION_MEMORY_MB"""
+    if not EXTRACTION_MEMORY_MB:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            mapped = int(statm.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = mapped + EXTRACTION_MEMORY_MB * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _limit_cpu():
+    """Allow the current process EXTRACTION_CPU_SECONDS more CPU time before SIGXCPU kills it"""
+    if not EXTRACTION_CPU_SECONDS:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(usage.ru_utime + usage.ru_stime) + EXTRACTION_CPU_SECONDS
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _run_sandbox_worker(connection):
+    """Body of a sandbox process: load everything, apply the limits, then run tasks until the pipe closes"""
+    global _sandboxed
+    _sandboxed = True
+    # Load the backends up front, as the address space limit leaves no room to load them later
+    resolve_pdf_backends()
+    _limit_memory()
+    tasks = 0
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+        _limit_cpu()
+        retire = False
+        try:
+            result = ('ok', function(*args))
+        except DocumentRejected as e:
+            result = ('rejected', str(e))
+            retire = isinstance(e.__context__, MemoryError)
+        except MemoryError:
+            result = ('rejected', 'PDF extraction exceeded the memory limit')
+            retire = True
+        except Exception as e:
+            result = ('error', str(e))
+        tasks += 1
+        # The process may be killed before its next periodic dump, so hand its metrics over now
+        try:
+            metrics.dump()
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {metrics.directory}: {str(e)}")
+        # A process that ran out of memory may be left fragmented, so it is replaced like an old one
+        retire = retire or bool(EXTRACTION_MAX_TASKS and tasks >= EXTRACTION_MAX_TASKS)
+        connection.send(result + (retire,))
+        if retire:
+            return
+
+
+class PageTimeout(Exception):
+    """Raised when a single PDF page takes longer than PDF_PAGE_TIMEOUT"""
+
+
+class DocumentRejected(Exception):
+    """Raised when a document is refused for exceeding a limit or being unreadable"""
+
+    status_code = 422
+
+
+@api.app_errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({'error': f"Upload exceeds the {request.max_content_length} byte limit"}), 413
+
+
+@api.app_errorhandler(DocumentRejected)
+def document_rejected(e):
+    return jsonify({'error': str(e)}), e.status_code
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeout()
+
+
+def _read_pdf_source(source):
+    """Return the raw bytes of a PDF given a path, bytes or a binary stream"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            return file.read()
+    return source.read()
+
+
+class PyPDF2Document:
+    """A PDF opened with PyPDF2, the original extractor"""
+
+    def __init__(self, data):
+        self._reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+    def __len__(self):
+        return len(self._reader.pages)
+
+    def page_text(self, number):
+        return self._reader.pages[number].extract_text() or ''
+
+
+class PypdfDocument(PyPDF2Document):
+    """A PDF opened with pypdf, PyPDF2's maintained successor"""
+
+    def __init__(self, data):
+        self._reader = get_component('pypdf').PdfReader(io.BytesIO(data))
+
+
+class PdfminerDocument:
+    """A PDF opened with pdfminer.six, slower but the most layout-aware"""
+
+    def __init__(self, data):
+        self._pdfminer = get_component('pdfminer')
+        self._pages = list(self._pdfminer.pdfpage.PDFPage.get_pages(io.BytesIO(data)))
+        self._resources = self._pdfminer.pdfinterp.PDFResourceManager()
+
+    def __len__(self):
+        return len(self._pages)
+
+    def page_text(self, number):
+        output = io.StringIO()
+        converter = self._pdfminer.converter.TextConverter(
+            self._resources, output, laparams=self._pdfminer.layout.LAParams())
+        try:
+            self._pdfminer.pdfinterp.PDFPageInterpreter(self._resources, converter).process_page(self._pages[number])
+        finally:
+            converter.close()
+        # pdfminer closes every page with a form feed
+        return output.getvalue().rstrip('\x0c')
+
+
+class PdfiumDocument:
+    """A PDF opened with pypdfium2, the PDFium engine used by Chrome"""
+
+    def __init__(self, data):
+        self._document = get_component('pypdfium2').PdfDocument(data)
+
+    def __len__(self):
+        return len(self._document)
+
+    def page_text(self, number):
+        page = self._document[number]
+        textpage = page.get_textpage()
+        try:
+            # PDFium ends lines with CRLF and leaves the last one open; end pages the way PyPDF2 does
+            text = textpage.get_text_range().replace('\r\n', '\n')
+            return text + '\n' if text and not text.endswith('\n') else text
+        finally:
+            textpage.close()
+            page.close()
+
+
+# Backend name -> (document class, component it needs), fastest first as measured by
+# 'python benchmark.py --pdf-backends'
+PDF_BACKEND_CLASSES = {
+    'pypdfium2': (PdfiumDocument, 'pypdfium2'),
+    'pypdf2': (PyPDF2Document, None),
+    'pypdf': (PypdfDocument, 'pypdf'),
+    'pdfminer': (PdfminerDocument, 'pdfminer')
+}
+
+# Characters a broken font mapping leaves behind: replacement, private use and control characters
+_GARBLED_RE = re.compile(r'[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]|\(cid:\d+\)')
+
+
+def is_readable_text(text):
+    """Whether extracted text looks like text, rather than nothing or font-mapping debris"""
+    visible = len(text) - text.count(' ') - text.count('\n')
+    if visible <= 0:
+        return False
+    garbled = sum(len(match) for match in _GARBLED_RE.findall(text))
+    alphanumeric = sum(1 for char in text if char.isalnum())
+    return garbled / visible < 0.1 and alphanumeric / visible > 0.5
+
+
+def resolve_pdf_backends(names=None):
+    """Expand 'auto' and drop backends that are unknown or not installed"""
+    resolved = []
+    for name in names or PDF_BACKENDS:
+        candidates = list(PDF_BACKEND_CLASSES) if name == 'auto' else [name]
+        for candidate in candidates:
+            if candidate in resolved or candidate not in PDF_BACKEND_CLASSES:
+                continue
+            component = PDF_BACKEND_CLASSES[candidate][1]
+            if component is None or get_component(component) is not None:
+                resolved.append(candidate)
+    return resolved or ['pypdf2']
+
+
+class PdfExtractor:
+    """Page text from the first backend that produces readable text.
+
+    The document is opened with the first backend that can parse it. A page
+    that comes out empty or garbled is retried with the following backends,
+    each opened only when first needed, and the first readable text wins.
+    """
+
+    def __init__(self, data, backends=None):
+        self._data = data
+        self._backends = resolve_pdf_backends(backends)
+        self._documents = {}
+        errors = []
+        for name in self._backends:
+            if self._open(name, errors) is not None:
+                self.backend = name
+                break
+        else:
+            raise DocumentRejected(f"Could not read PDF: {errors[0] if errors else 'no backend available'}")
+        self._fallbacks = self._backends[self._backends.index(self.backend) + 1:]
+        self.page_count = len(self._documents[self.backend])
+
+    def _open(self, name, errors=None):
+        if name not in self._documents:
+            try:
+                self._documents[name] = PDF_BACKEND_CLASSES[name][0](self._data)
+            except MemoryError:
+                raise
+            except Exception as e:
+                logger.warning(f"PDF backend {name} could not open the document: {str(e)}")
+                if errors is not None:
+                    errors.append(str(e))
+                self._documents[name] = None
+        return self._documents[name]
+
+    def __len__(self):
+        return self.page_count
+
+    def page_text(self, number):
+        text = self._documents[self.backend].page_text(number)
+        if is_readable_text(text):
+            return text
+        for name in self._fallbacks:
+            document = self._open(name)
+            if document is None or number >= len(document):
+                continue
+            try:
+                candidate = document.page_text(number)
+            except MemoryError:
+                raise
+            except Exception as e:
+                logger.warning(f"PDF backend {name} failed on page {number + 1}: {str(e)}")
+                continue
+            if is_readable_text(candidate):
+                metrics.inc('resume_pdf_fallbacks_total', backend=name)
+                return candidate
+        return text
+
+
+def _extract_pages(reader, start, stop, page_timeout):
+    """Yield the text of pages [start, stop), skipping pages that time out.
+
+    The timeout relies on SIGALRM, so it is only enforced on the main thread
+    of a process, which is where pool workers run their tasks.
+    """
+    use_alarm = bool(page_timeout) and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_page_timeout)
     try:
-        with open(filepath, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
+        for number in range(start, stop):
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, page_timeout)
+            try:
+                yield reader.page_text(number)
+            except PageTimeout:
+                logger.warning(f"Skipping PDF page {number + 1}: extraction exceeded {page_timeout}s")
+                yield ''
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _extract_page_range(data, start, stop, page_timeout, backends):
+    """Extract a range of pages inside a pool worker"""
+    reader = PdfExtractor(data, backends)
+    return list(_extract_pages(reader, start, stop, page_timeout))
+
+
+def _pages_to_extract(page_count, max_pages, parallel):
+    """Apply the page limits to a document, returning how many pages to extract and whether in parallel"""
+    if PDF_REJECT_PAGES and page_count > PDF_REJECT_PAGES:
+        raise DocumentRejected(f"PDF has {page_count} pages, the limit is {PDF_REJECT_PAGES}")
+    if max_pages and page_count > max_pages:
+        logger.warning(f"PDF has {page_count} pages, extracting the first {max_pages}")
+        page_count = max_pages
+    if parallel is None:
+        parallel = WORKER_PROCESSES > 1 and page_count >= PDF_PARALLEL_MIN_PAGES
+    return page_count, parallel
+
+
+def _plan_extraction(data, max_pages, page_timeout, backends, parallel):
+    """Open a document inside a sandbox process and decide how to extract it.
+
+    Returns the page count, how many pages to extract, whether they go in
+    parallel, and the text of the pages when they do not; a parallel document
+    is left entirely to the range tasks so that none of them waits on this one.
+    """
+    reader = PdfExtractor(data, backends)
+    page_count, parallel = _pages_to_extract(len(reader), max_pages, parallel)
+    pages = [] if parallel else list(_extract_pages(reader, 0, page_count, page_timeout))
+    return len(reader), page_count, parallel, pages
+
+
+def iter_pdf_pages(source, parallel=None, max_pages=PDF_MAX_PAGES, page_timeout=PDF_PAGE_TIMEOUT, backends=None):
+    """Yield the text of each PDF page in order.
+
+    Large documents are split into ranges of PDF_PAGES_PER_TASK pages and
+    extracted on a process pool. Only a bounded window of ranges is in flight
+    at once, and pages are yielded as soon as their range is done. With
+    EXTRACTION_SANDBOX on, the document is only ever parsed in sandbox
+    processes: the first one counts the pages, extracting them itself when
+    the document is too small to split, and the ranges are spread over all.
+    """
+    data = _read_pdf_source(source)
+    # Sandbox and job worker processes extract on their own core, and daemonic ones cannot start a pool
+    if _sandboxed or multiprocessing.current_process().daemon:
+        parallel = False
+    if EXTRACTION_SANDBOX and not _sandboxed:
+        pool = get_sandbox_pool()
+        total, page_count, parallel, pages = pool.run(_plan_extraction, data, max_pages, page_timeout,
+                                                      backends, parallel)
+        record_input_size(pdf_pages=total)
+        yield from pages
+        first, window = len(pages), pool.size * 2
+    else:
+        reader = PdfExtractor(data, backends)
+        record_input_size(pdf_pages=len(reader))
+        page_count, parallel = _pages_to_extract(len(reader), max_pages, parallel)
+        if not parallel:
+            yield from _extract_pages(reader, 0, page_count, page_timeout)
+            return
+        pool = get_worker_pool()
+        first, window = 0, WORKER_PROCESSES * 2
+
+    pending = deque()
+    try:
+        for start in range(first, page_count, PDF_PAGES_PER_TASK):
+            stop = min(start + PDF_PAGES_PER_TASK, page_count)
+            pending.append(pool.submit(_extract_page_range, data, start, stop, page_timeout, backends))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    except BrokenProcessPool:
+        reset_worker_pool()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+@api.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """Analyze many resumes, streaming one NDJSON record per file as each finishes.
+
+    Accepts either several 'resumes' files or a zip 'archive' of PDFs.
+    """
+    archive = request.files.get('archive')
+    if archive is not None:
+        try:
+            bundle = zipfile.ZipFile(archive.stream)
+        except zipfile.BadZipFile:
+            return jsonify({'error': 'Archive is not a valid zip file'}), 400
+        documents = [(info.filename, partial(_read_archive_member, bundle, info))
+                     for info in bundle.infolist()
+                     if not info.is_dir() and info.filename.lower().endswith('.pdf')]
+    else:
+        documents = [(file.filename, file.stream.read) for file in request.files.getlist('resumes')]
+
+    if not documents:
+        return jsonify({'error': 'No PDF files were uploaded'}), 400
+
+    # The uploads are read while the response streams, so close them only at the end
+    upload_request = request._get_current_object()
+    upload_request.defer_close = True
+
+    def generate():
+        try:
+            for record in iter_batch_results(documents):
+                yield json.dumps(record) + '\n'
+        finally:
+            upload_request.defer_close = False
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] in ('queued', 'running'):
+        # Polls also replace workers that died or were killed for running past JOB_TIMEOUT
+        start_job_workers()
+    return jsonify(job)
+
+
+@api.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Stream a job's status changes as server-sent events until it finishes"""
+    if job_queue.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        last_status = None
+        deadline = time.time() + JOB_TIMEOUT
+        while time.time() < deadline:
+            job = job_queue.get(job_id)
+            if job is None:
+                return
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield f"event: status\ndata: {json.dumps(job)}\n\n"
+            if last_status in ('done', 'failed'):
+                return
+            time.sleep(JOB_POLL_INTERVAL)
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
+@api.route('/candidates/search', methods=['POST'])
+def search_candidates():
+    """Rank previously analyzed candidates against a job's required skills"""
+    query = request.get_json(silent=True) or {}
+    skills = query.get('skills')
+    if not skills or not isinstance(skills, (list, dict)):
+        return jsonify({'error': 'Provide the required skills as a list or a skill-to-weight mapping'}), 400
+    if not all(isinstance(skill, str) for skill in skills):
+        return jsonify({'error': 'Skill names must be strings'}), 400
+    if isinstance(skills, dict) and not all(isinstance(weight, (int, float)) and not isinstance(weight, bool)
+                                            for weight in skills.values()):
+        return jsonify({'error': 'Skill weights must be numbers'}), 400
+    try:
+        top_k = max(1, int(query.get('top_k', 10)))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k must be an integer'}), 400
+
+    return jsonify({
+        'candidates': candidate_index.search(skills, top_k),
+        'indexed_candidates': len(candidate_index)
+    })
+
+
+@api.route('/candidates/<candidate_id>', methods=['DELETE'])
+def delete_candidate(candidate_id):
+    if not candidate_index.remove(candidate_id):
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify({'deleted': candidate_id})
+
+
+@api.route('/job_descriptions', methods=['POST'])
+def add_job_description():
+    """Parse a job description once and keep it for matching resumes against"""
+    body = request.get_json(silent=True) or {}
+    text = body.get('text')
+    if not text or not isinstance(text, str):
+        return jsonify({'error': 'Provide the job description text'}), 400
+    jd = job_description_index.add(text, body.get('id'), body.get('title'))
+    return jsonify(jd.describe()), 201
+
+
+@api.route('/job_descriptions/<jd_id>', methods=['GET'])
+def get_job_description(jd_id):
+    jd = job_description_index.get(jd_id)
+    if jd is None:
+        return jsonify({'error': 'Job description not found'}), 404
+    return jsonify(jd.describe())
+
+
+@api.route('/job_descriptions/<jd_id>', methods=['DELETE'])
+def delete_job_description(jd_id):
+    if not job_description_index.remove(jd_id):
+        return jsonify({'error': 'Job description not found'}), 404
+    return jsonify({'deleted': jd_id})
+
+
+@api.route('/job_descriptions/<jd_id>/match', methods=['POST'])
+def match_job_description(jd_id):
+    """Rank uploaded resumes against a stored job description.
+
+    Accepts PDFs as 'resume' files, or JSON {"resumes": [{"id": ..., "text": ...}]}.
+    """
+    jd = job_description_index.get(jd_id)
+    if jd is None:
+        return jsonify({'error': 'Job description not found'}), 404
+
+    if request.is_json:
+        documents = [(str(resume.get('id', index)), resume.get('text'))
+                     for index, resume in enumerate((request.get_json(silent=True) or {}).get('resumes') or [])
+                     if isinstance(resume, dict)]
+    else:
+        documents = [(file.filename, file) for file in request.files.getlist('resume')]
+    if not documents:
+        return jsonify({'error': 'No resumes provided'}), 400
+
+    taxonomy = get_taxonomy()
+    names, resumes, errors = [], [], []
+    for name, source in documents:
+        try:
+            if isinstance(source, str):
+                text = source
+            elif source is None or not source.filename.lower().endswith('.pdf'):
+                raise ValueError('Only PDF files or resume text are allowed')
+            else:
+                text = extract_text_from_pdf(source.stream.read())
+            lowered = lower_preserving_offsets(text)
+            skills = extract_skills(text, lowered, taxonomy)
+            names.append(name)
+            resumes.append((lowered, skills['technical'] + skills['soft']))
+        except Exception as e:
+            errors.append({'resume': name, 'error': str(e)})
+
+    with timed_stage('match_job_description'):
+        records = job_description_index.score(jd, resumes)
+    ranked = sorted(({'resume': name, **record} for name, record in zip(names, records)),
+                    key=lambda record: record['score'], reverse=True)
+    return jsonify({'job_description': jd.id, 'results': ranked, 'errors': errors})
+
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose stage timings, input sizes and cache counters to Prometheus"""
+    lines = [metrics.render()]
+    for name, value in result_cache.stats().items():
+        if isinstance(value, (int, float)):
+            lines.append(f"# TYPE resume_cache_{name} gauge\nresume_cache_{name} {value}\n")
+    lines.append(f"# TYPE resume_indexed_candidates gauge\nresume_indexed_candidates {len(candidate_index)}\n")
+    return Response(''.join(lines), mimetype='text/plain; version=0.0.4')
+
+
+@api.route('/startup_report', methods=['GET'])
+def get_startup_report():
+    return jsonify(startup_report())
+
+
+@api.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+
+def _read_archive_member(bundle, info):
+    """Read one PDF from a batch archive, refusing members that inflate past MAX_UPLOAD_BYTES"""
+    if info.file_size > MAX_UPLOAD_BYTES:
+        raise DocumentRejected(f"Archive member is {info.file_size} bytes, the limit is {MAX_UPLOAD_BYTES}")
+    return bundle.read(info)
+
+
+def extract_text_from_pdf(source, **options):
+    try:
+        with timed_stage('extract_text_from_pdf'):
+            text = _collect_text(source, options)
+        record_input_size(text_chars=len(text))
         return text
     except Exception as e:
         logger.error(f"Error extracting PDF text: {str(e)}")
         raise
 
-def analyze_text(text):
+
+def _collect_text(source, options):
+    """Join the extracted pages, giving up as soon as the text exceeds MAX_TEXT_CHARS"""
+    # Sections and date ranges run across page breaks, so analysis still waits for the whole text
+    pages, length = [], 0
+    try:
+        for page in iter_pdf_pages(source, **options):
+            length += len(page)
+            if MAX_TEXT_CHARS and length > MAX_TEXT_CHARS:
+                raise DocumentRejected(f"PDF text exceeds the {MAX_TEXT_CHARS} character limit")
+            pages.append(page)
+    except PyPDF2.errors.PdfReadError as e:
+        raise DocumentRejected(f"Could not read PDF: {str(e)}")
+    except MemoryError:
+        raise DocumentRejected('PDF extraction exceeded the memory limit')
+    return ''.join(pages)
+
+
+def analyze_pdf_document(name, data):
+    """Analyze one PDF inside a pool worker, reporting failures as a record"""
+    try:
+        if not name.lower().endswith('.pdf'):
+            raise ValueError('Only PDF files are allowed')
+        text = extract_text_from_pdf(data, parallel=False)
+        return {'file': name, 'status': 'ok', 'result': analyze_text(text)}
+    except Exception as e:
+        return {'file': name, 'status': 'error', 'error': str(e)}
+
+
+def extract_pdf_document(name, data):
+    """Extract one PDF's text inside a sandbox process"""
+    if not name.lower().endswith('.pdf'):
+        raise DocumentRejected('Only PDF files are allowed')
+    return extract_text_from_pdf(data, parallel=False)
+
+
+def _export_batch_record(record):
+    if record['status'] == 'ok' and analytics_exporter.directory:
+        analytics_exporter.record(analytics_row(record['result'], 'analyze_batch'))
+    return record
+
+
+def iter_batch_results(documents):
+    """Analyze (name, read) pairs on the worker pool and yield records as they finish.
+
+    Each file is only read when it is submitted and at most two files per
+    worker are in flight, so memory stays bounded whatever the batch size.
+    A file that cannot be read or analyzed yields an error record instead of
+    aborting the batch. With EXTRACTION_SANDBOX on, only the text extraction
+    runs in the sandbox processes and the analysis runs here.
+    """
+    if EXTRACTION_SANDBOX:
+        pool, task, window = get_sandbox_pool(), extract_pdf_document, EXTRACTION_SANDBOX_PROCESSES * 2
+    else:
+        pool, task, window = get_worker_pool(), analyze_pdf_document, WORKER_PROCESSES * 2
+    pending = {}
+    try:
+        for name, read in documents:
+            try:
+                pending[pool.submit(task, name, read())] = name
+            except BrokenProcessPool:
+                reset_worker_pool()
+                raise
+            except Exception as e:
+                yield {'file': name, 'status': 'error', 'error': str(e)}
+                continue
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _batch_record(pending.pop(future), future)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _batch_record(pending.pop(future), future)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _batch_record(name, future):
+    try:
+        record = future.result()
+        if isinstance(record, str):
+            # Text extracted in the sandbox
+            record = {'file': name, 'status': 'ok', 'result': analyze_text(record)}
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        return {'file': name, 'status': 'error', 'error': str(e)}
+    return _export_batch_record(record)
+
+
+def run_batch(directory, output=sys.stdout):
+    """Analyze every PDF under directory and write NDJSON records to output"""
+    paths = sorted(glob.glob(os.path.join(directory, '**', '*.pdf'), recursive=True))
+    documents = [(os.path.relpath(path, directory), partial(_read_pdf_source, path)) for path in paths]
+    failures = 0
+    for record in iter_batch_results(documents):
+        failures += record['status'] != 'ok'
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+    logger.info(f"Analyzed {len(documents)} files, {failures} failed")
+    return failures
+
+
+def analyze_text(text, taxonomy=None, max_bullets=None):
     try:
+        taxonomy = taxonomy or get_taxonomy()
         word_count = len(text.split())
 
-        blob = TextBlob(text)
-        sentiment = blob.sentiment
-        sentiment_interpretation = interpret_sentiment(sentiment.polarity, sentiment.subjectivity)
+        # Lowercase and segment once; every later stage reads the same span index
+        with timed_stage('extract_sections'):
+            lowered = lower_preserving_offsets(text)
+            spans = segment_sections(text, lowered)
+            sections = extract_sections(text, spans)
 
-        sections = extract_sections(text)
-        formatted_sections = format_sections(sections)
+        # Skill matches and sentiment tokens are computed per section and reused for unchanged sections
+        with timed_stage('section_analysis'):
+            chunks = analyze_section_chunks(text, lowered, spans, taxonomy)
 
-        skills = extract_skills(text)
+        with timed_stage('sentiment'):
+            polarity, subjectivity, section_sentiment = score_sentiment(text, lowered, spans, chunks=chunks)
+            sentiment_interpretation = interpret_sentiment(polarity, subjectivity)
+        with timed_stage('format_sections'):
+            formatted_sections = format_sections_cached(sections, max_bullets)
 
-        job_matches = get_job_recommendations(skills)
+        with timed_stage('extract_skills'):
+            found = {}
+            for _, chunk in chunks:
+                found.update(chunk['skills'])
+            skills = group_skills(found, taxonomy.matcher)
 
-        courses = get_course_recommendations(job_matches)
+        with timed_stage('recommendations'):
+            job_matches = get_job_recommendations(skills, taxonomy=taxonomy)
+            courses = get_course_recommendations(job_matches, taxonomy)
 
-        profile_summary = extract_profile_summary(text)
-        profile_improvements = suggest_profile_improvements(profile_summary)
+        with timed_stage('extract_entities'):
+            entities = extract_entities(text, lowered, spans)
 
-        suggestions = get_resume_suggestions(sections, skills, word_count)
+        with timed_stage('suggestions'):
+            profile_summary = extract_profile_summary(text, spans)
+            profile_improvements = suggest_profile_improvements(profile_summary)
+            suggestions = get_resume_suggestions(sections, skills, word_count)
 
         return {
             'word_count': word_count,
             'sentiment_analysis': {
                 'raw_scores': {
-                    'polarity': round(sentiment.polarity, 2),
-                    'subjectivity': round(sentiment.subjectivity, 2)
+                    'polarity': round(polarity, 2),
+                    'subjectivity': round(subjectivity, 2)
                 },
-                'interpretation': sentiment_interpretation
+                'interpretation': sentiment_interpretation,
+                'sections': section_sentiment
             },
-            
+
             'sections': formatted_sections,
             'skills_analysis': {
                 'technical_skills': skills['technical'],
                 'soft_skills': skills['soft'],
                 'skills_score': calculate_skills_score(skills)
             },
+            'entities': entities,
             'job_recommendations': job_matches,
             'course_recommendations': courses,
             'profile_improvements': profile_improvements,
@@ -284,11 +2778,12 @@ def analyze_text(text):
         logger.error(f"Error in text analysis: {str(e)}")
         raise
 
-def extract_profile_summary(text):
-    summary_pattern = re.compile(r"(summary|profile|objective)(.*?)(experience|skills|education|certifications|$)", re.IGNORECASE | re.DOTALL)
-    match = summary_pattern.search(text)
-    if match:
-        return match.group(2).strip()
+def extract_profile_summary(text, spans=None):
+    if spans is None:
+        spans = segment_sections(text)
+    for span in spans:
+        if span.name in ('summary', 'objective'):
+            return text[span.body_start:span.end].strip()
     return ""
 
 def suggest_profile_improvements(summary):
@@ -302,55 +2797,127 @@ def suggest_profile_improvements(summary):
             suggestions.append("Include quantifiable achievements or years of experience.")
     return suggestions
 
-def extract_skills(text):
+SkillMatch = namedtuple('SkillMatch', ['skill', 'category', 'start', 'end'])
+
+# Lowercases ASCII only, so offsets into the lowered text match the original
+_ASCII_LOWER = {c: c + 32 for c in range(ord('A'), ord('Z') + 1)}
+
+
+def lower_preserving_offsets(text):
+    """Lowercase text without changing its length"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = text.translate(_ASCII_LOWER)
+    return lowered
+
+
+class SkillMatcher:
+    """Skill taxonomy compiled once into a trie and scanned in a single pass.
+
+    The trie is emitted as one nested regular expression, so the scan runs in
+    the regex engine and its cost depends on the text length and the longest
+    skill rather than on the number of skills. Matches must sit on word
+    boundaries, so short skills like 'r' or 'go' no longer match inside words
+    and aliases like 'js' do not match the tail of 'node.js'. Aliases are
+    reported as the skill they stand for.
+    """
+
+    _TERMINAL = ''
+
+    def __init__(self, taxonomy, aliases=None):
+        self._trie = {}
+        self._skills = {}
+        self.order = {}
+        for category, skills in taxonomy.items():
+            for skill in skills:
+                key = skill.lower()
+                if key in self._skills:
+                    continue
+                self._skills[key] = (skill, category)
+                self.order[skill] = len(self.order)
+                self._insert(key)
+
+        for alias, skill in (aliases or {}).items():
+            key = alias.lower()
+            if key in self._skills:
+                continue
+            if skill.lower() not in self._skills:
+                raise ValueError(f"Alias '{alias}' refers to unknown skill '{skill}'")
+            self._skills[key] = self._skills[skill.lower()]
+            self._insert(key)
+
+        pattern = self._compile_node(self._trie) or '(?!)'
+        self._regex = re.compile(r'(?<!\w)(?<!\w\.)(?=(' + pattern + r')(?!\w))')
+
+    def _insert(self, key):
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[self._TERMINAL] = key
+
+    def canonical(self, skill):
+        """Return the taxonomy name for a skill or alias, or the lowercased name if unknown"""
+        entry = self._skills.get(skill.lower())
+        return entry[0] if entry else skill.lower()
+
+    def _compile_node(self, node):
+        branches = [re.escape(char) + self._compile_node(child)
+                    for char, child in sorted(node.items()) if char != self._TERMINAL]
+        if not branches:
+            return ''
+        if len(branches) == 1 and self._TERMINAL not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if self._TERMINAL in node else group
+
+    def scan(self, text, lowered=None):
+        """Yield a SkillMatch for every skill occurrence in text"""
+        if lowered is None:
+            lowered = lower_preserving_offsets(text)
+        for match in self._regex.finditer(lowered):
+            start = match.start()
+            longest = match.group(1)
+
+            # The regex reports the longest skill at each start; walk the trie
+            # to also report shorter skills that end on a word boundary
+            node = self._trie
+            for offset, char in enumerate(longest, 1):
+                node = node[char]
+                key = node.get(self._TERMINAL)
+                if key is None:
+                    continue
+                end = start + offset
+                if offset < len(longest) and (lowered[end].isalnum() or lowered[end] == '_'):
+                    continue
+                skill, category = self._skills[key]
+                yield SkillMatch(skill, category, start, end)
+
+
+def find_skills(text, taxonomy=None):
+    """Return every skill occurrence in the resume with its offsets and category"""
+    return list((taxonomy or get_taxonomy()).matcher.scan(text))
+
+
+def extract_skills(text, lowered=None, taxonomy=None):
     """Extract technical and soft skills from resume"""
-    technical_skills = {
-        'programming_languages': [
-            'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-            'typescript', 'scala', 'perl', 'r', 'matlab', 'sql', 'html', 'css'
-        ],
-        'frameworks': [
-            'react', 'angular', 'vue', 'django', 'flask', 'spring', 'node.js', 'express',
-            'tensorflow', 'pytorch', 'keras', 'pandas', 'numpy', 'scikit-learn'
-        ],
-        'databases': [
-            'mysql', 'postgresql', 'mongodb', 'oracle', 'sqlite', 'redis', 'cassandra',
-            'elasticsearch', 'dynamodb'
-        ],
-        'tools': [
-            'git', 'docker', 'kubernetes', 'jenkins', 'aws', 'azure', 'gcp', 'jira',
-            'confluence', 'slack', 'postman', 'webpack', 'npm', 'yarn'
-        ],
-        'concepts': [
-            'agile', 'scrum', 'ci/cd', 'rest api', 'microservices', 'cloud computing',
-            'machine learning', 'artificial intelligence', 'data science', 'blockchain'
-        ]
-    }
+    matcher = (taxonomy or get_taxonomy()).matcher
+    found = {match.skill: match.category for match in matcher.scan(text, lowered)}
+    return group_skills(found, matcher)
 
-    soft_skills = [
-        'leadership', 'communication', 'teamwork', 'problem solving', 'critical thinking',
-        'time management', 'project management', 'analytical skills', 'attention to detail',
-        'creativity', 'adaptability', 'collaboration', 'organization', 'presentation',
-        'negotiation', 'conflict resolution', 'decision making', 'mentoring', 'multitasking'
-    ]
 
+def group_skills(found, matcher):
+    """Split {skill: category} into technical and soft skill lists"""
     found_skills = {
         'technical': [],
         'soft': []
     }
 
-    text_lower = text.lower()
-
-    # Find technical skills
-    for category, skills in technical_skills.items():
-        for skill in skills:
-            if skill in text_lower:
-                found_skills['technical'].append(skill)
-
-    # Find soft skills
-    for skill in soft_skills:
-        if skill in text_lower:
+    # Report skills in taxonomy order, as the per-skill scan used to
+    for skill in sorted(found, key=matcher.order.__getitem__):
+        if found[skill] == 'soft':
             found_skills['soft'].append(skill)
+        else:
+            found_skills['technical'].append(skill)
 
     return found_skills
 
@@ -365,116 +2932,558 @@ def calculate_skills_score(skills):
     total_score = (technical_score * technical_weight) + (soft_score * soft_weight)
     return round(total_score, 1)
 
-def get_job_recommendations(skills):
-    """Recommend suitable job roles based on skills"""
-    job_roles = {
-        'Software Developer': {
-            'required_skills': ['python', 'java', 'javascript', 'git', 'sql'],
-            'weight': 0
-        },
-        'Data Scientist': {
-            'required_skills': ['python', 'machine learning', 'sql', 'statistics', 'tensorflow', 'pandas'],
-            'weight': 0
-        },
-        'DevOps Engineer': {
-            'required_skills': ['docker', 'kubernetes', 'jenkins', 'aws', 'ci/cd', 'git'],
-            'weight': 0
-        },
-        'Frontend Developer': {
-            'required_skills': ['html', 'css', 'javascript', 'react', 'angular', 'typescript'],
-            'weight': 0
-        },
-        'Backend Developer': {
-            'required_skills': ['python', 'java', 'sql', 'node.js', 'rest api', 'microservices'],
-            'weight': 0
-        }
-    }
+JOB_MATCH_THRESHOLD = 30
+
+
+class RoleCatalogue:
+    """Job roles encoded as a sparse role x skill weight matrix.
+
+    A resume becomes a binary skill vector, so scoring it against every role
+    is one sparse matrix product regardless of the catalogue size. Skills are
+    normalized with canonical, so roles and resumes may name a skill by alias.
+    """
+
+    # Resumes scored per matrix product, which bounds the dense score block
+    BATCH_SIZE = 256
+
+    def __init__(self, roles, canonical=str.lower):
+        self.roles = list(roles)
+        self.canonical = canonical
+        self.skill_index = {}
+        rows, cols, weights = [], [], []
+        for row, requirements in enumerate(roles.values()):
+            required = requirements['required_skills']
+            if not isinstance(required, dict):
+                required = dict.fromkeys(required, 1.0)
+            for skill, weight in required.items():
+                rows.append(row)
+                cols.append(self.skill_index.setdefault(canonical(skill), len(self.skill_index)))
+                weights.append(float(weight))
+
+        shape = (len(self.roles), len(self.skill_index))
+        self.matrix = sparse.csr_matrix((weights, (rows, cols)), shape=shape)
+        self.totals = np.asarray(self.matrix.sum(axis=1)).ravel()
+
+    def encode(self, skill_sets):
+        """Encode resumes as a sparse binary resume x skill matrix"""
+        rows, cols = [], []
+        for row, skills in enumerate(skill_sets):
+            for skill in set(skills):
+                col = self.skill_index.get(self.canonical(skill))
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        shape = (len(skill_sets), len(self.skill_index))
+        return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+
+    def score(self, skill_sets):
+        """Return the match percentage of each resume against each role"""
+        matched = (self.encode(skill_sets) @ self.matrix.T).toarray()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(self.totals > 0, matched / self.totals * 100, 0.0)
+        return scores
+
+    def recommend(self, skill_sets, top_k=3, threshold=JOB_MATCH_THRESHOLD):
+        """Return the top_k roles above threshold for each resume"""
+        recommendations = []
+        for offset in range(0, len(skill_sets), self.BATCH_SIZE):
+            scores = self.score(skill_sets[offset:offset + self.BATCH_SIZE])
+            recommendations.extend(self._top_roles(row, top_k, threshold) for row in scores)
+        return recommendations
+
+    def _top_roles(self, scores, top_k, threshold):
+        candidates = np.flatnonzero(scores > threshold)
+        rounded = np.round(scores[candidates])
+
+        # Order by rounded percentage, then catalogue position, as a stable sort would
+        order_key = -rounded * len(self.roles) + candidates
+        if len(candidates) > top_k:
+            top = np.argpartition(order_key, top_k - 1)[:top_k]
+            candidates, rounded, order_key = candidates[top], rounded[top], order_key[top]
+        order = np.argsort(order_key)
+
+        return [{'role': self.roles[index], 'match_percentage': int(percentage)}
+                for index, percentage in zip(candidates[order], rounded[order])]
+
+
+class Taxonomy:
+    """Skill, role and course tables compiled into the structures analysis uses.
+
+    A taxonomy is never modified once built. Reloading builds a new one and
+    swaps the module reference, so a request holding the previous taxonomy
+    finishes with consistent tables.
+    """
+
+    def __init__(self, skills, roles, courses, mtimes=None):
+        self.technical_skills = skills['technical']
+        self.soft_skills = skills['soft']
+        self.aliases = skills.get('aliases', {})
+        self.matcher = SkillMatcher({**self.technical_skills, 'soft': self.soft_skills}, self.aliases)
+        self.roles = roles
+        self.role_catalogue = RoleCatalogue(roles, self.matcher.canonical)
+        self.courses = courses
+        self.mtimes = mtimes or {}
+
+        # Identifies the tables so cached results from older tables are not reused
+        self.version = hashlib.sha256(
+            json.dumps([skills, roles, courses], sort_keys=True).encode()
+        ).hexdigest()[:12]
+
+    @classmethod
+    def load(cls, skills_path=SKILLS_PATH, roles_path=ROLE_CATALOGUE_PATH, courses_path=COURSES_PATH):
+        """Build a taxonomy from the JSON data files"""
+        documents, mtimes = [], {}
+        for path in (skills_path, roles_path, courses_path):
+            # Stat before reading, so a write that lands mid-load is seen as a change next time
+            mtimes[path] = os.stat(path).st_mtime_ns
+            with open(path, encoding='utf-8') as data_file:
+                documents.append(json.load(data_file))
+        skills, roles, courses = documents
+        return cls(skills, roles.get('roles', roles), courses.get('courses', courses), mtimes)
+
+    def is_stale(self):
+        """Check whether any data file changed since this taxonomy was loaded"""
+        try:
+            return any(os.stat(path).st_mtime_ns != mtime for path, mtime in self.mtimes.items())
+        except OSError:
+            # A file being replaced may briefly not exist; check again later
+            return False
+
+
+_taxonomy = Taxonomy.load()
+_taxonomy_checked = time.monotonic()
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """Return the current taxonomy, reloading it first if its data files changed"""
+    global _taxonomy, _taxonomy_checked
+    if time.monotonic() - _taxonomy_checked < TAXONOMY_RELOAD_INTERVAL:
+        return _taxonomy
+
+    # One thread checks and rebuilds; the others keep using the current tables meanwhile
+    if not _taxonomy_lock.acquire(blocking=False):
+        return _taxonomy
+    try:
+        _taxonomy_checked = time.monotonic()
+        if _taxonomy.is_stale():
+            try:
+                reloaded = Taxonomy.load()
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.error(f"Keeping taxonomy {_taxonomy.version}, reload failed: {str(e)}")
+            else:
+                logger.info(f"Reloaded taxonomy {_taxonomy.version} -> {reloaded.version}")
+                _taxonomy = reloaded
+    finally:
+        _taxonomy_lock.release()
+    return _taxonomy
 
-    all_skills = skills['technical'] + skills['soft']
-    recommendations = []
 
-    for role, requirements in job_roles.items():
-        matching_skills = sum(1 for skill in requirements['required_skills']
-                            if skill in all_skills)
-        match_percentage = (matching_skills / len(requirements['required_skills'])) * 100
+def get_job_recommendations(skills, top_k=3, taxonomy=None):
+    """Recommend suitable job roles based on skills"""
+    catalogue = (taxonomy or get_taxonomy()).role_catalogue
+    return catalogue.recommend([skills['technical'] + skills['soft']], top_k)[0]
 
-        if match_percentage > 30:
-            recommendations.append({
-                'role': role,
-                'match_percentage': round(match_percentage)
-            })
 
-    recommendations.sort(key=lambda x: x['match_percentage'], reverse=True)
-    return recommendations[:3]
+def get_batch_job_recommendations(skills_list, top_k=3, taxonomy=None):
+    """Recommend job roles for many resumes with one matrix product per batch"""
+    skill_sets = [skills['technical'] + skills['soft'] for skills in skills_list]
+    return (taxonomy or get_taxonomy()).role_catalogue.recommend(skill_sets, top_k)
 
-def get_course_recommendations(job_matches):
-    """Recommend courses based on job matches"""
-    courses_db = {
-        'Software Developer': [
-            'Complete Python Developer in 2024 (Udemy)',
-            'Java Programming Masterclass (Coursera)',
-            'Modern JavaScript from the Beginning (Udemy)'
-        ],
-        'Data Scientist': [
-            'Data Science Specialization (Coursera)',
-            'Machine Learning A-Z (Udemy)',
-            'Statistics for Data Science (edX)'
-        ],
-        'DevOps Engineer': [
-            'Docker & Kubernetes: The Complete Guide (Udemy)',
-            'AWS Certified DevOps Engineer (AWS)',
-            'Jenkins CI/CD Masterclass (Udemy)'
-        ],
-        'Frontend Developer': [
-            'React - The Complete Guide (Udemy)',
-            'Advanced CSS and Sass (Udemy)',
-            'Modern Angular Bootcamp (Udemy)'
-        ],
-        'Backend Developer': [
-            'Node.js Developer Course (Udemy)',
-            'Python Django Masterclass (Udemy)',
-            'Advanced SQL (Stanford Online)'
-        ]
-    }
 
+def get_course_recommendations(job_matches, taxonomy=None):
+    """Recommend courses based on job matches"""
+    courses = (taxonomy or get_taxonomy()).courses
     recommended_courses = set()
     for job in job_matches:
         if job['match_percentage'] > 40:
             role = job['role']
-            if role in courses_db:
-                recommended_courses.update(courses_db[role][:2])
+            if role in courses:
+                recommended_courses.update(courses[role][:2])
 
     return list(recommended_courses)
 
-def extract_sections(text):
+SECTION_HEADERS = {
+    'summary': ['summary', 'professional summary', 'career summary', 'profile', 'professional profile', 'about me'],
+    'objective': ['objective', 'career objective'],
+    'experience': ['experience', 'work experience', 'professional experience', 'work history',
+                   'employment', 'employment history', 'career history'],
+    'education': ['education', 'academic background', 'education and training'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'competencies'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications']
+}
+
+SectionSpan = namedtuple('SectionSpan', ['name', 'start', 'body_start', 'end'])
+
+
+def _compile_section_headers(headers):
+    # A header is a synonym at the start of a line, followed by a colon or the end of the line
+    groups = []
+    for name, synonyms in headers.items():
+        alternatives = sorted(synonyms, key=len, reverse=True)
+        group = '|'.join(re.escape(synonym).replace(r'\ ', r'[ \t]+') for synonym in alternatives)
+        groups.append(f'(?P<{name}>{group})')
+    return re.compile(r'^[ \t]*(?:' + '|'.join(groups) + r')[ \t]*(?::|(?=\r?$))', re.MULTILINE)
+
+
+_SECTION_HEADER_RE = _compile_section_headers(SECTION_HEADERS)
+
+
+def segment_sections(text, lowered=None):
+    """Split the resume into ordered section spans in one pass over the text"""
+    if lowered is None:
+        lowered = lower_preserving_offsets(text)
+    headers = list(_SECTION_HEADER_RE.finditer(lowered))
+    spans = []
+    for index, match in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        spans.append(SectionSpan(match.lastgroup, match.start(), match.end(), end))
+    return spans
+
+
+def extract_sections(text, spans=None):
     """Extract different sections from the resume"""
+    if spans is None:
+        spans = segment_sections(text)
+
     sections = {}
-    headers = ['education', 'experience', 'skills', 'projects', 'summary', 'objective']
-
-    for header in headers:
-        start = text.lower().find(header)
-        if start != -1:
-            next_header = float('inf')
-            for h in headers:
-                pos = text.lower().find(h, start + len(header))
-                if pos != -1 and pos < next_header:
-                    next_header = pos
-
-            if next_header == float('inf'):
-                sections[header] = text[start:].strip()
-            else:
-                sections[header] = text[start:next_header].strip()
+    for span in spans:
+        body = text[span.body_start:span.end].strip()
+        if sections.get(span.name):
+            if body:
+                sections[span.name] += '\n' + body
+        else:
+            sections[span.name] = body
 
     return sections
 
-def format_sections(sections):
-    """Format section content into bullet points"""
+_MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+_MONTH_PATTERN = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|' \
+                 r'sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+
+
+def _date_pattern(prefix):
+    return (rf'(?:(?P<{prefix}_month>{_MONTH_PATTERN})[ \t]+|(?P<{prefix}_num>0?[1-9]|1[0-2])[/.-])?'
+            rf'(?P<{prefix}_year>(?:19|20)\d{{2}})')
+
+
+# Matched against the lowered text, e.g. 'jan 2019 - present' or '03/2017 to 06/2019'
+_DATE_RANGE_RE = re.compile(
+    r'\b' + _date_pattern('start') + r'[ \t]*(?:-|–|—|to|until)[ \t]*'
+    r'(?:(?P<open>present|current|now|today|date)\b|' + _date_pattern('end') + r')')
+
+_TITLE_KEYWORDS = ('Engineer', 'Developer', 'Manager', 'Analyst', 'Scientist', 'Designer', 'Consultant',
+                   'Architect', 'Intern', 'Administrator', 'Specialist', 'Lead', 'Director', 'Coordinator',
+                   'Officer', 'Technician', 'Programmer', 'Researcher')
+_TITLE_RE = re.compile(r"\b(?:[A-Z][\w+#/&.-]*[ \t]+){0,4}(?:" + '|'.join(_TITLE_KEYWORDS) + r")\b")
+_EMPLOYER_RE = re.compile(r"(?:\bat|@|\|)[ \t]+((?:[A-Z0-9][\w&.'-]*)(?:[ \t]+(?:&[ \t]+)?[A-Z0-9][\w&.'-]*){0,4})")
+
+_DEGREE_RE = re.compile(
+    r"\b(?:(?:Bachelor|Master|Doctor|Associate)(?:'s)?(?:[ \t]+(?:of|in))?(?:[ \t]+(?:[A-Z][A-Za-z]*|of|in|and)){1,6}"
+    r"|(?:B\.?Sc|M\.?Sc|B\.?Tech|M\.?Tech|B\.?Eng|M\.?Eng|MBA|Ph\.?D|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.E\.|"
+    r"(?:BS|MS|BA|MA)(?=[ \t]+in\b))\.?(?:[ \t]+in[ \t]+[A-Z][A-Za-z]*(?:[ \t]+(?:[A-Z][A-Za-z]*|and|of))*)?)")
+_INSTITUTION_RE = re.compile(
+    r"\b(?:[A-Z][\w&.'-]*[ \t]+){0,5}(?:University|College|Institute|School|Academy|Polytechnic)"
+    r"(?:[ \t]+(?:of|and|for|&)(?:[ \t]+(?:of|and|for|&))*[ \t]+[A-Z][\w&.'-]*(?:[ \t]+[A-Z][\w&.'-]*)*)*")
+
+
+def _month_index(match, prefix, today):
+    if prefix == 'end' and match.group('open'):
+        return today.year * 12 + today.month - 1
+    year = int(match.group(f'{prefix}_year'))
+    month = match.group(f'{prefix}_month')
+    if month:
+        return year * 12 + _MONTHS[month[:3]] - 1
+    number = match.group(f'{prefix}_num')
+    return year * 12 + (int(number) - 1 if number else 0)
+
+
+def _unique(values):
+    return list(dict.fromkeys(value.strip(' \t.,;:-') for value in values if value.strip(' \t.,;:-')))
+
+
+def _spans_text(text, spans, names):
+    """Return (start, end) ranges of the named sections, or the whole text when none exist"""
+    ranges = [(span.body_start, span.end) for span in spans if span.name in names]
+    return ranges or [(0, len(text))]
+
+
+def extract_entities(text, lowered=None, spans=None, backend=None):
+    """Extract employment history, job titles, degrees and institutions.
+
+    Works from the lowered text and section span index shared with the other
+    stages: date ranges and titles are only read from experience sections,
+    degrees and institutions from education sections. Total experience is
+    the sum of the employment ranges after merging overlaps.
+    """
+    return extract_entities_batch([(text, lowered, spans)], backend)[0]
+
+
+def extract_entities_batch(documents, backend=None):
+    """Extract entities for many (text, lowered, spans) documents, batching spaCy over all of them"""
+    backend = backend or ENTITY_BACKEND
+    today = datetime.date.today()
+    results, employment_contexts, education_texts = [], [], []
+
+    for text, lowered, spans in documents:
+        if lowered is None:
+            lowered = lower_preserving_offsets(text)
+        if spans is None:
+            spans = segment_sections(text, lowered)
+
+        employment, titles, intervals = [], [], []
+        for start, end in _spans_text(text, spans, ('experience',)):
+            for match in _DATE_RANGE_RE.finditer(lowered, start, end):
+                # An entry's title and employer sit on the date line or the line above it
+                line_start = text.rfind('\n', start, match.start())
+                context_start = text.rfind('\n', start, max(line_start, start)) + 1 if line_start > start else start
+                context = text[context_start:match.start()]
+                title = _TITLE_RE.findall(context)
+                employer = _EMPLOYER_RE.findall(context)
+                first, last = _month_index(match, 'start', today), _month_index(match, 'end', today)
+                if last < first:
+                    continue
+                intervals.append((first, last))
+                employment.append({
+                    'title': title[-1].strip() if title else None,
+                    'employer': employer[-1].strip() if employer else None,
+                    'start': f"{first // 12}-{first % 12 + 1:02d}",
+                    'end': 'present' if match.group('open') else f"{last // 12}-{last % 12 + 1:02d}",
+                    'months': last - first
+                })
+                employment_contexts.append((len(results), len(employment) - 1, context))
+            titles.extend(_TITLE_RE.findall(text, start, end))
+
+        degrees, institutions = [], []
+        for start, end in _spans_text(text, spans, ('education',)):
+            degrees.extend(_DEGREE_RE.findall(text, start, end))
+            institutions.extend(_INSTITUTION_RE.findall(text, start, end))
+            education_texts.append((len(results), text[start:end]))
+
+        # Merge overlapping ranges so concurrent roles are not double counted
+        months = 0
+        covered_until = None
+        for first, last in sorted(intervals):
+            if covered_until is None or first > covered_until:
+                months += last - first
+                covered_until = last
+            elif last > covered_until:
+                months += last - covered_until
+                covered_until = last
+
+        results.append({
+            'employment': employment,
+            'total_years_experience': round(months / 12, 1),
+            'job_titles': _unique(titles),
+            'degrees': _unique(degrees),
+            'institutions': _unique(institutions)
+        })
+
+    if backend == 'spacy':
+        _add_spacy_organizations(results, employment_contexts, education_texts)
+    return results
+
+
+def _add_spacy_organizations(results, employment_contexts, education_texts):
+    """Fill employers and institutions from spaCy ORG entities in one nlp.pipe batch"""
+    nlp = get_component('spacy')
+    if nlp is None:
+        return
+    disabled = [pipe for pipe in nlp.pipe_names if pipe not in ('tok2vec', 'ner')]
+    texts = [context for _, _, context in employment_contexts] + [body for _, body in education_texts]
+    docs = nlp.pipe(texts, disable=disabled, batch_size=64)
+
+    for doc_index, entry_index, _ in employment_contexts:
+        organizations = [ent.text for ent in next(docs).ents if ent.label_ == 'ORG']
+        entry = results[doc_index]['employment'][entry_index]
+        if organizations and not entry['employer']:
+            entry['employer'] = organizations[-1]
+    for doc_index, _ in education_texts:
+        organizations = [ent.text for ent in next(docs).ents if ent.label_ == 'ORG']
+        results[doc_index]['institutions'] = _unique(results[doc_index]['institutions'] + organizations)
+
+
+def iter_section_chunks(text, spans):
+    """Yield (name, start, body_start, end) for the text before the first header and each section.
+
+    Chunks cover the text and each starts on a line, so tokens and skill
+    matches never straddle two chunks and each can be analyzed on its own.
+    """
+    first = spans[0].start if spans else len(text)
+    if first:
+        yield None, 0, 0, first
+    for span in spans:
+        yield span.name, span.start, span.body_start, span.end
+
+
+def _analyze_chunk(chunk, lowered, body_offset, matcher, lexicon, per_section):
+    """Skill matches, sentiment tokens and body sentiment of one chunk"""
+    result = {'skills': {match.skill: match.category for match in matcher.scan(chunk, lowered)},
+              'tokens': None, 'sentiment': None}
+    if lexicon is not None:
+        matches = list(_SENTIMENT_TOKEN_RE.finditer(lowered))
+        result['tokens'] = [match.group() for match in matches]
+        if per_section and body_offset is not None:
+            body = result['tokens'][bisect_left([match.start() for match in matches], body_offset):]
+            polarity, subjectivity = _average_sentiment(_sentiment_assessments(body, lexicon))
+            result['sentiment'] = {'polarity': round(polarity, 2), 'subjectivity': round(subjectivity, 2)}
+    return result
+
+
+def analyze_section_chunks(text, lowered, spans, taxonomy):
+    """Return (section name, result) per chunk, reusing cached results for chunks seen before.
+
+    Results are keyed by the chunk text, the taxonomy version and the
+    sentiment settings, so an edited resume only reanalyzes the sections
+    that changed.
+    """
+    lexicon = get_component('sentiment_lexicon') if SENTIMENT_BACKEND == 'lexicon' else None
+    per_section = SENTIMENT_PER_SECTION
+    kind = f"section:{SENTIMENT_BACKEND}:{int(per_section)}"
+    profile = _current_profile.get()
+
+    chunks, reused = [], 0
+    for name, start, body_start, end in iter_section_chunks(text, spans):
+        chunk = text[start:end]
+        key = section_cache.key(kind, chunk.encode(), taxonomy.version) if SECTION_CACHE_MAX_ENTRIES else None
+        payload = section_cache.get(key) if key else None
+        if payload is not None:
+            result = json.loads(payload)
+            reused += 1
+        else:
+            body_offset = body_start - start if name is not None else None
+            result = _analyze_chunk(chunk, lowered[start:end], body_offset, taxonomy.matcher, lexicon, per_section)
+            if key:
+                section_cache.put(key, json.dumps(result).encode())
+        chunks.append((name, result))
+
+    metrics.inc('resume_section_cache_total', reused, result='hit')
+    metrics.inc('resume_section_cache_total', len(chunks) - reused, result='miss')
+    if profile is not None:
+        profile['sections_reused'] = f"{reused}/{len(chunks)}"
+    return chunks
+
+
+def format_sections_cached(sections, max_bullets=None):
+    """format_sections with each section's bullets cached by its content"""
+    if not SECTION_CACHE_MAX_ENTRIES:
+        return format_sections(sections, max_bullets)
+    formatted_sections = {}
+    for section, content in sections.items():
+        if not content:
+            continue
+        key = section_cache.key(f"bullets:{max_bullets or 'all'}", content.encode())
+        payload = section_cache.get(key)
+        if payload is None:
+            payload = json.dumps(format_sections({section: content}, max_bullets).get(section, [])).encode()
+            section_cache.put(key, payload)
+        formatted_sections[section] = json.loads(payload)
+    return formatted_sections
+
+
+def diff_analyses(previous, current):
+    """Summarize what changed between two analyses of a resume"""
+    def skill_set(results):
+        return set(results['skills_analysis']['technical_skills'] + results['skills_analysis']['soft_skills'])
+
+    def score(results, *path):
+        for key in path:
+            results = results[key]
+        return results
+
+    previous_skills, current_skills = skill_set(previous), skill_set(current)
+    previous_suggestions = previous['improvement_suggestions'] + previous['profile_improvements']
+    current_suggestions = current['improvement_suggestions'] + current['profile_improvements']
+    previous_roles = {job['role']: job['match_percentage'] for job in previous['job_recommendations']}
+    current_roles = {job['role']: job['match_percentage'] for job in current['job_recommendations']}
+    previous_sections, current_sections = previous['sections'], current['sections']
+
+    scores = {}
+    for name, path in (('skills_score', ('skills_analysis', 'skills_score')),
+                       ('polarity', ('sentiment_analysis', 'raw_scores', 'polarity')),
+                       ('subjectivity', ('sentiment_analysis', 'raw_scores', 'subjectivity')),
+                       ('word_count', ('word_count',))):
+        before, after = score(previous, *path), score(current, *path)
+        scores[name] = {'previous': before, 'current': after, 'change': round(after - before, 2)}
+
+    return {
+        'scores': scores,
+        'skills': {
+            'added': sorted(current_skills - previous_skills),
+            'removed': sorted(previous_skills - current_skills)
+        },
+        'suggestions': {
+            'added': [s for s in current_suggestions if s not in previous_suggestions],
+            'resolved': [s for s in previous_suggestions if s not in current_suggestions]
+        },
+        'job_recommendations': {
+            role: {'previous': previous_roles.get(role), 'current': current_roles.get(role)}
+            for role in dict.fromkeys(list(previous_roles) + list(current_roles))
+            if previous_roles.get(role) != current_roles.get(role)
+        },
+        'sections': {
+            'added': [name for name in current_sections if name not in previous_sections],
+            'removed': [name for name in previous_sections if name not in current_sections],
+            'changed': [name for name in current_sections
+                        if name in previous_sections and current_sections[name] != previous_sections[name]]
+        }
+    }
+
+
+BULLET_GLYPHS = '•●○◦■□▪▫♦◆◇❖►▶▸‣⁃∙·➢➤✓✔'
+
+# Bullet markers: a dash or asterisk counts only when spaced, so 'scikit-learn' stays whole, and
+# numbering may be nested ('1.2', '2.3.1.') or lettered ('a)', '(iv)')
+_BULLET_MARKER = r'(?:[-–—*]|\d+(?:\.\d+)+\.?|\d+[.)]|[a-z][.)]|\((?:[ivx]+|[a-z])\)|[ivx]+\))(?=\s)'
+
+# Bullets end at a line break, taking any marker that opens the next line with it, at a bullet glyph
+# anywhere, or at a spaced dash or '1.'/'2)' inside a line. Separators also take the spaces after
+# them, so bullets come out left-stripped. Every branch starts with a character class, which lets
+# the regex engine skip straight to candidate characters
+_BULLET_SEPARATOR_RE = re.compile(
+    r'(?:[\r\n][\r\n]*(?:[ \t]*' + _BULLET_MARKER + r')?'
+    r'|[' + BULLET_GLYPHS + r']'
+    r'|\s(?:[-–—*]|\d{1,2}[.)])(?=\s))[^\S\r\n]*')
+_LEADING_BULLET_RE = re.compile(r'\s*(?:' + _BULLET_MARKER + r'[^\S\r\n]*)?')
+
+# The stripped text of a bullet: first to last non-space character, never crossing a line
+_BULLET_TEXT_RE = re.compile(r'\S(?:.*\S)?')
+
+# Shorter fragments are headings, dates or stray words rather than bullets
+MIN_BULLET_CHARS = 10
+
+
+def iter_bullet_spans(text, start=0, end=None):
+    """Yield the (start, end) span of each non-empty bullet in text[start:end], already stripped"""
+    end = len(text) if end is None else end
+    position = _LEADING_BULLET_RE.match(text, start, end).end()
+    for separator in _BULLET_SEPARATOR_RE.finditer(text, position, end):
+        stop = separator.start()
+        if stop > position:
+            # Only a bullet with trailing spaces needs a second look to strip them
+            if text[stop - 1].isspace():
+                stripped = _BULLET_TEXT_RE.search(text, position, stop)
+                if stripped:
+                    yield stripped.span()
+            else:
+                yield position, stop
+        position = separator.end()
+    if end > position:
+        stripped = _BULLET_TEXT_RE.search(text, position, end)
+        if stripped:
+            yield stripped.span()
+
+
+def format_sections(sections, max_bullets=None):
+    """Format section content into bullet points, keeping at most max_bullets per section"""
     formatted_sections = {}
     for section, content in sections.items():
         if content:
-            bullets = re.split(r'[•\-\●\■\♦\◆\○\●]|\d+\.|[\n\r]+', content)
-            bullets = [b.strip() for b in bullets if b.strip() and len(b.strip()) > 10]
-            formatted_sections[section] = bullets
+            bullets = (content[start:end] for start, end in iter_bullet_spans(content)
+                       if end - start > MIN_BULLET_CHARS)
+            formatted_sections[section] = list(islice(bullets, max_bullets))
     return formatted_sections
 
 def get_resume_suggestions(sections, skills, word_count):
@@ -498,6 +3507,178 @@ def get_resume_suggestions(sections, skills, word_count):
 
     return suggestions
 
+# Words that flip the polarity of the next known word, as in TextBlob's pattern analyzer
+SENTIMENT_NEGATIONS = frozenset(('no', 'not', "n't", 'never'))
+
+# Words and exclamation marks; TextBlob splits apostrophes and edge punctuation the same way
+_SENTIMENT_TOKEN_RE = re.compile(r"[^\W_]+(?:[-.][^\W_]+)*|!")
+
+
+def compile_sentiment_lexicon(path):
+    """Compile the pattern sentiment XML into {word: (polarity, subjectivity, intensity, is_adverb)}.
+
+    Scores are averaged over senses and parts of speech exactly as TextBlob
+    does when it scores untagged text, including the adverbs it derives from
+    adjectives ('terrible' -> 'terribly').
+    """
+    senses = {}
+    for node in ElementTree.parse(path).getroot().iter('word'):
+        form = node.get('form')
+        if form:
+            scores = (float(node.get('polarity', 0.0)), float(node.get('subjectivity', 0.0)),
+                      float(node.get('intensity', 1.0)))
+            senses.setdefault(form, {}).setdefault(node.get('pos'), []).append(scores)
+
+    def average(rows):
+        return tuple(sum(column) / len(column) for column in zip(*rows))
+
+    words = {}
+    for form, by_pos in senses.items():
+        per_pos = {pos: average(rows) for pos, rows in by_pos.items()}
+        per_pos[None] = average(per_pos.values())
+        words[form] = per_pos
+
+    for form, per_pos in list(words.items()):
+        if 'JJ' in per_pos:
+            stem = form[:-1] + 'i' if form.endswith('y') else form
+            stem = stem[:-2] if stem.endswith('le') else stem
+            adverb = words.setdefault(stem + 'ly', {})
+            adverb['RB'] = adverb[None] = per_pos['JJ']
+
+    return {form: per_pos[None] + ('RB' in per_pos,) for form, per_pos in words.items()}
+
+
+def _sentiment_assessments(tokens, lexicon):
+    """Return a (polarity, subjectivity) pair for each scored word group in tokens.
+
+    Follows TextBlob's pattern analyzer: a known adverb scales the next known
+    word by its intensity, a preceding negation halves and flips polarity,
+    and '!' boosts the previous group.
+    """
+    assessments = []
+    modifier = None
+    negation = None
+    for token in tokens:
+        entry = lexicon.get(token)
+        if entry is not None:
+            polarity, subjectivity, intensity, is_adverb = entry
+            if modifier is None:
+                assessments.append([polarity, subjectivity, intensity, False])
+            else:
+                last = assessments[-1]
+                last[0] = max(-1.0, min(polarity * last[2], 1.0))
+                last[1] = max(-1.0, min(subjectivity * last[2], 1.0))
+                last[2] = intensity
+            if negation is not None:
+                last = assessments[-1]
+                if last[2]:
+                    last[2] = 1.0 / last[2]
+                last[3] = True
+            modifier = token if is_adverb else None
+            negation = token if token in SENTIMENT_NEGATIONS else None
+            continue
+
+        if token in SENTIMENT_NEGATIONS:
+            negation = token
+        elif negation is not None and len(token) > 1:
+            negation = None
+        if negation is not None and modifier is not None and modifier.endswith('ly'):
+            assessments[-1][3] = True
+            negation = None
+        elif modifier is not None and len(token) > 2:
+            modifier = None
+        if token == '!' and assessments:
+            assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+
+    return [(-0.5 * polarity if negated else polarity, subjectivity)
+            for polarity, subjectivity, _, negated in assessments]
+
+
+def _average_sentiment(assessments):
+    if not assessments:
+        return 0.0, 0.0
+    return (sum(polarity for polarity, _ in assessments) / len(assessments),
+            sum(subjectivity for _, subjectivity in assessments) / len(assessments))
+
+
+def score_sentiment(text, lowered=None, spans=None, backend=None, per_section=None, chunks=None):
+    """Return (polarity, subjectivity, per-section scores) for the resume.
+
+    The lexicon backend tokenizes the text once and scores the document and
+    each section span from the same token list. Per-section scores are None
+    when disabled or when scoring with TextBlob. Chunks from
+    analyze_section_chunks supply the tokens and section scores instead.
+    """
+    backend = backend or SENTIMENT_BACKEND
+    per_section = SENTIMENT_PER_SECTION if per_section is None else per_section
+    lexicon = get_component('sentiment_lexicon') if backend == 'lexicon' else None
+
+    if lexicon is None:
+        TextBlob = get_component('textblob')
+        if TextBlob is None:
+            return 0.0, 0.0, None
+        sentiment = TextBlob(text).sentiment
+        return sentiment.polarity, sentiment.subjectivity, None
+
+    if chunks is not None:
+        tokens = [token for _, chunk in chunks for token in chunk['tokens']]
+        polarity, subjectivity = _average_sentiment(_sentiment_assessments(tokens, lexicon))
+        if not per_section:
+            return polarity, subjectivity, None
+        sections = {}
+        for name, chunk in chunks:
+            if name is not None:
+                sections.setdefault(name, chunk['sentiment'])
+        return polarity, subjectivity, sections
+
+    if lowered is None:
+        lowered = lower_preserving_offsets(text)
+    matches = list(_SENTIMENT_TOKEN_RE.finditer(lowered))
+    tokens = [match.group() for match in matches]
+    polarity, subjectivity = _average_sentiment(_sentiment_assessments(tokens, lexicon))
+
+    if not per_section:
+        return polarity, subjectivity, None
+    if spans is None:
+        spans = segment_sections(text, lowered)
+    starts = [match.start() for match in matches]
+    sections = {}
+    for span in spans:
+        section_tokens = tokens[bisect_left(starts, span.body_start):bisect_left(starts, span.end)]
+        section_polarity, section_subjectivity = _average_sentiment(_sentiment_assessments(section_tokens, lexicon))
+        sections.setdefault(span.name, {
+            'polarity': round(section_polarity, 2),
+            'subjectivity': round(section_subjectivity, 2)
+        })
+    return polarity, subjectivity, sections
+
+
+def validate_sentiment(texts):
+    """Compare the lexicon scorer with TextBlob over a corpus of texts"""
+    TextBlob = get_component('textblob')
+    if TextBlob is None:
+        raise RuntimeError('TextBlob is required to validate the sentiment lexicon')
+
+    differences = []
+    for text in texts:
+        polarity, subjectivity, _ = score_sentiment(text, backend='lexicon', per_section=False)
+        expected = TextBlob(text).sentiment
+        differences.append((abs(polarity - expected.polarity), abs(subjectivity - expected.subjectivity)))
+
+    count = len(differences) or 1
+    return {
+        'documents': len(differences),
+        'mean_abs_error': {
+            'polarity': round(sum(d[0] for d in differences) / count, 4),
+            'subjectivity': round(sum(d[1] for d in differences) / count, 4)
+        },
+        'max_abs_error': {
+            'polarity': round(max((d[0] for d in differences), default=0.0), 4),
+            'subjectivity': round(max((d[1] for d in differences), default=0.0), 4)
+        }
+    }
+
+
 def interpret_sentiment(polarity, subjectivity):
     """Interpret sentiment scores"""
     interpretation = {
@@ -554,5 +3735,116 @@ def interpret_sentiment(polarity, subjectivity):
 
     return interpretation
 
+WARM_UP_TEXT = """Professional Summary
+Software engineer with 5 years of experience building Python and React applications.
+Work Experience
+Senior Software Engineer at Example Corp
+Jan 2020 - Present
+• Led migration to Docker and Kubernetes, cutting deploy time by 40%
+Education
+Bachelor of Science in Computer Science, Example University
+Skills
+Python, SQL, AWS, communication, teamwork
+"""
+
+_ready = threading.Event()
+
+
+def warm_up():
+    """Load the components the configured backends use and run one analysis, then report ready.
+
+    Meant to run before server workers fork, as gunicorn's preload_app does,
+    so they share the loaded models and compiled tables copy-on-write.
+    """
+    started = time.perf_counter()
+    components = {'lexicon': 'sentiment_lexicon', 'textblob': 'textblob'}.get(SENTIMENT_BACKEND)
+    for name in filter(None, (components, 'spacy' if ENTITY_BACKEND == 'spacy' else None)):
+        get_component(name)
+    resolve_pdf_backends()
+    get_taxonomy()
+    analyze_text(WARM_UP_TEXT)
+    _ready.set()
+    logger.info(f"Warmed up in {time.perf_counter() - started:.2f}s, RSS {current_rss_mb():.0f} MB")
+
+
+def reset_after_fork():
+    """Drop the state a forked server worker must not share with its parent"""
+    global _worker_pool, _sandbox_pool, _worker_pool_lock
+    _worker_pool, _sandbox_pool, _worker_pool_lock = None, None, threading.Lock()
+    # SQLite stores open connections of their own in a new process, so only these need resetting
+    metrics.reset_after_fork()
+    analytics_exporter.reset_after_fork()
+
+
+@api.route('/health', methods=['GET'])
+def health():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+
+@api.route('/ready', methods=['GET'])
+def ready():
+    """Readiness: only once warm_up has loaded the components and run a first analysis"""
+    if not _ready.is_set():
+        return jsonify({'status': 'warming up'}), 503
+    return jsonify({'status': 'ready', 'taxonomy_version': get_taxonomy().version,
+                    'components': startup_report()['components']})
+
+
+def create_app():
+    """Create the Flask application with every route registered"""
+    flask_app = Flask(__name__)
+    flask_app.request_class = SpooledUploadRequest
+    CORS(flask_app, resources={r"/*": {"origins": "http://localhost:5173","methods": ["POST"]}})
+    flask_app.register_blueprint(api)
+    return flask_app
+
+
+app = create_app()
+
+STARTUP_SECONDS = time.perf_counter() - _import_started
+logger.info(f"Imported in {STARTUP_SECONDS:.2f}s, RSS {current_rss_mb():.0f} MB")
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Resume Analyzer')
+    parser.add_argument('--batch', metavar='DIR', help='analyze every PDF under DIR and print NDJSON results')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='load every enabled component and print the startup time and memory report')
+    parser.add_argument('--job-worker', action='store_true', help='run a worker that drains the async job queue')
+    parser.add_argument('--exit-with-parent', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--validate-sentiment', metavar='DIR',
+                        help='compare the sentiment lexicon with TextBlob on the .txt and .pdf files under DIR')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--debug', action='store_true', help='run the development server with the debugger and reloader')
+    args = parser.parse_args()
+
+    if args.job_worker:
+        if not JOB_QUEUE_DB:
+            parser.error('--job-worker needs JOB_QUEUE_DB set to the queue the web processes use')
+        run_job_worker(job_queue, args.exit_with_parent)
+        sys.exit(0)
+    if args.validate_sentiment:
+        paths = sorted(glob.glob(os.path.join(args.validate_sentiment, '**', '*.*'), recursive=True))
+        texts = []
+        for path in paths:
+            if path.lower().endswith('.pdf'):
+                texts.append(extract_text_from_pdf(path, parallel=False))
+            elif path.lower().endswith('.txt'):
+                with open(path, encoding='utf-8') as f:
+                    texts.append(f.read())
+        print(json.dumps(validate_sentiment(texts), indent=2))
+        sys.exit(0)
+
+    if args.startup_report:
+        for name in COMPONENT_LOADERS:
+            get_component(name)
+        print(json.dumps(startup_report(), indent=2))
+        sys.exit(0)
+    if args.batch:
+        sys.exit(1 if run_batch(args.batch) else 0)
+
+    # Production serving goes through gunicorn with gunicorn.conf.py and wsgi.py
+    warm_up()
+    if EXTRACTION_SANDBOX:
+        get_sandbox_pool()
+    app.run(debug=args.debug, port=args.port)
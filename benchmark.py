@@ -0,0 +1,349 @@
+"""Benchmark suite for the resume analyzer.
+
+Generates a reproducible synthetic corpus of resumes (plain text and PDF)
+across size bands and skill densities, times the analysis helpers one by
+one and end to end through the Flask test client, and writes the results
+as JSON. A stored run can be passed as a baseline to fail on regressions.
+
+    python benchmark.py --output results.json
+    python benchmark.py --baseline results.json --threshold 0.10
+    python benchmark.py --pdf-backends --output backends.json
+"""
+import os
+
+# Benchmark the analysis itself, not the result cache, a persisted index or the analytics export
+os.environ['RESULT_CACHE_MAX_ENTRIES'] = '0'
+os.environ['SECTION_CACHE_MAX_ENTRIES'] = '0'
+os.environ.pop('RESULT_CACHE_DB', None)
+os.environ.pop('CANDIDATE_INDEX_DIR', None)
+os.environ.pop('ANALYTICS_DIR', None)
+
+import argparse
+import gc
+import io
+import json
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import app
+
+PAGE_BANDS = (1, 2, 5, 10, 25, 50)
+DENSITIES = ('sparse', 'dense')
+LINES_PER_PAGE = 55
+
+BENCHMARKS = ('extract_text_from_pdf', 'analyze_text', 'extract_skills', 'extract_sections',
+              'format_sections', 'get_job_recommendations', 'end_to_end')
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Sam', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Okafor', 'Novak', 'Silva', 'Kim']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Systems']
+TITLES = ['Software Engineer', 'Senior Developer', 'Data Scientist', 'DevOps Engineer',
+          'Frontend Developer', 'Backend Engineer', 'Engineering Manager']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+VERBS = ['Built', 'Designed', 'Led', 'Improved', 'Migrated', 'Automated', 'Maintained', 'Delivered']
+OUTCOMES = ['reducing latency by {n}%', 'serving {n}k daily users', 'cutting costs by {n}%',
+            'with an excellent team of {n} engineers', 'improving reliability to 99.{n}%']
+FILLER = ['a reporting service', 'the billing platform', 'an internal dashboard',
+          'the onboarding flow', 'a data pipeline', 'the search feature']
+SUMMARY_SENTENCES = [
+    'Motivated engineer with {n} years of experience building reliable products.',
+    'Passionate about clean code, great teamwork and delivering successful projects.',
+    'Known for a positive attitude and strong communication with stakeholders.',
+    'Experienced in leading small teams and mentoring junior developers.'
+]
+
+
+def generate_resume_lines(rng, pages, density):
+    """Return the lines of one synthetic resume filling roughly the given pages"""
+    taxonomy = app.get_taxonomy()
+    technical = [skill for skills in taxonomy.technical_skills.values() for skill in skills]
+    skills_per_bullet = (0, 1) if density == 'sparse' else (3, 5)
+
+    def bullet():
+        count = rng.randint(*skills_per_bullet)
+        used = ', '.join(rng.sample(technical, count))
+        line = f"{rng.choice(VERBS)} {rng.choice(FILLER)}"
+        if used:
+            line += f" using {used}"
+        return f"• {line}, {rng.choice(OUTCOMES).format(n=rng.randint(2, 60))}"
+
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+             'email@example.com | +1 555 0100 | github.com/example',
+             'Professional Summary']
+    lines += [sentence.format(n=rng.randint(2, 15)) for sentence in rng.sample(SUMMARY_SENTENCES, 3)]
+
+    lines.append('Skills')
+    lines.append(', '.join(rng.sample(technical, 4 if density == 'sparse' else 20)))
+    lines.append(', '.join(rng.sample(taxonomy.soft_skills, 2 if density == 'sparse' else 8)))
+
+    lines.append('Education')
+    lines.append('Bachelor of Science in Computer Science, State University, 2012 - 2016')
+
+    lines.append('Work Experience')
+    year = 2024
+    target = pages * LINES_PER_PAGE - 6
+    while len(lines) < target:
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}")
+        lines.append(f"{rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {year}")
+        lines += [bullet() for _ in range(rng.randint(3, 6))]
+        year = start
+
+    lines.append('Projects')
+    lines += [bullet() for _ in range(3)]
+    lines.append('Certifications')
+    lines.append('AWS Certified Solutions Architect, 2021')
+    return lines
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('cp1252', 'replace')
+
+
+def build_pdf(lines):
+    """Render text lines as a minimal multi-page PDF using the built-in Helvetica font"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    first_page = 4
+    kids = ' '.join(f"{first_page + 2 * i} 0 R" for i in range(len(pages)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    ]
+    for index, page_lines in enumerate(pages):
+        content = b"BT /F1 10 Tf 12 TL 50 770 Td " + b" ".join(
+            b"(" + _pdf_escape(line) + b") Tj T*" for line in page_lines) + b" ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> "
+                       f"/Contents {first_page + 2 * index + 1} 0 R >>".encode())
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def generate_corpus(seed=0, bands=PAGE_BANDS, densities=DENSITIES):
+    """Return {band name: {'text', 'pdf', 'pages', 'density'}} for every size band and density"""
+    corpus = {}
+    for pages in bands:
+        for density in densities:
+            rng = random.Random(f"{seed}-{pages}-{density}")
+            lines = generate_resume_lines(rng, pages, density)
+            corpus[f"{pages}p-{density}"] = {
+                'text': '\n'.join(lines),
+                'pdf': build_pdf(lines),
+                'pages': pages,
+                'density': density
+            }
+    return corpus
+
+
+def save_corpus(corpus, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, sample in corpus.items():
+        with open(os.path.join(directory, f"{name}.pdf"), 'wb') as f:
+            f.write(sample['pdf'])
+        with open(os.path.join(directory, f"{name}.txt"), 'w', encoding='utf-8') as f:
+            f.write(sample['text'])
+
+
+def make_cases(sample, client):
+    """Return the callable for each benchmark on one corpus sample"""
+    text, pdf = sample['text'], sample['pdf']
+    sections = app.extract_sections(text)
+    skills = app.extract_skills(text)
+
+    def end_to_end():
+        response = client.post('/analyze_resume', data={'resume': (io.BytesIO(pdf), 'resume.pdf')})
+        if response.status_code != 200:
+            raise RuntimeError(f"/analyze_resume returned {response.status_code}: {response.get_data(as_text=True)}")
+
+    return {
+        'extract_text_from_pdf': lambda: app.extract_text_from_pdf(pdf),
+        'analyze_text': lambda: app.analyze_text(text),
+        'extract_skills': lambda: app.extract_skills(text),
+        'extract_sections': lambda: app.extract_sections(text),
+        'format_sections': lambda: app.format_sections(sections),
+        'get_job_recommendations': lambda: app.get_job_recommendations(skills),
+        'end_to_end': end_to_end
+    }
+
+
+def word_recall(expected, extracted):
+    """Share of the words in expected, counted with repeats, that also appear in extracted"""
+    expected_words = Counter(re.findall(r'\w+', expected.lower()))
+    found = Counter(re.findall(r'\w+', extracted.lower()))
+    total = sum(expected_words.values())
+    return sum(min(count, found[word]) for word, count in expected_words.items()) / total if total else 1.0
+
+
+def make_backend_cases(sample):
+    """Return a whole-document extraction callable for each installed PDF backend"""
+    def extract(document_class):
+        document = document_class(sample['pdf'])
+        return ''.join(document.page_text(number) for number in range(len(document)))
+
+    return {name: (lambda document_class=app.PDF_BACKEND_CLASSES[name][0]: extract(document_class))
+            for name in app.resolve_pdf_backends(['auto'])}
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run_case(func, iterations, warmup):
+    for _ in range(warmup):
+        func()
+
+    gc.collect()
+    timings = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+
+    # Measure allocations in a separate call so tracing does not skew the timings
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'throughput_per_s': round(iterations / total, 2),
+        'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'peak_alloc_kb': round(peak / 1024, 1)
+    }
+
+
+def run(corpus, benchmarks, iterations, warmup):
+    client = app.app.test_client()
+    results = {}
+    for band, sample in corpus.items():
+        cases = make_cases(sample, client)
+        for name in benchmarks:
+            key = f"{name}[{band}]"
+            results[key] = run_case(cases[name], iterations, warmup)
+            print(f"{key:45s} p50 {results[key]['p50_ms']:9.2f} ms  "
+                  f"p99 {results[key]['p99_ms']:9.2f} ms  "
+                  f"{results[key]['throughput_per_s']:9.1f}/s", file=sys.stderr)
+    return results
+
+
+def run_pdf_backends(corpus, iterations, warmup):
+    """Time each PDF backend on its own and score its text against the generated source"""
+    results = {}
+    for band, sample in corpus.items():
+        for name, func in make_backend_cases(sample).items():
+            key = f"pdf_backend:{name}[{band}]"
+            results[key] = run_case(func, iterations, warmup)
+            results[key]['word_recall'] = round(word_recall(sample['text'], func()), 4)
+            print(f"{key:45s} p50 {results[key]['p50_ms']:9.2f} ms  "
+                  f"p99 {results[key]['p99_ms']:9.2f} ms  "
+                  f"recall {results[key]['word_recall']:.2%}", file=sys.stderr)
+    return results
+
+
+def environment(seed, iterations):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'iterations': iterations
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return the benchmarks whose p50 latency grew by more than threshold"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous or not previous['p50_ms']:
+            continue
+        change = current['p50_ms'] / previous['p50_ms'] - 1
+        if change > threshold:
+            regressions.append((key, previous['p50_ms'], current['p50_ms'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the resume analyzer on a synthetic corpus')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bands', default=','.join(map(str, PAGE_BANDS)),
+                        help='comma-separated page counts to generate')
+    parser.add_argument('--only', help='comma-separated benchmarks to run, from: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed relative p50 slowdown before a benchmark counts as a regression')
+    parser.add_argument('--save-corpus', metavar='DIR', help='also write the generated corpus to DIR')
+    parser.add_argument('--pdf-backends', action='store_true',
+                        help='compare the installed PDF text backends instead of running the benchmarks')
+    args = parser.parse_args()
+
+    benchmarks = args.only.split(',') if args.only else BENCHMARKS
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    corpus = generate_corpus(args.seed, [int(band) for band in args.bands.split(',')])
+    if args.save_corpus:
+        save_corpus(corpus, args.save_corpus)
+
+    if args.pdf_backends:
+        results = run_pdf_backends(corpus, args.iterations, args.warmup)
+    else:
+        results = run(corpus, benchmarks, args.iterations, args.warmup)
+    report = {
+        'environment': environment(args.seed, args.iterations),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for key, before, after, change in regressions:
+            print(f"REGRESSION {key}: p50 {before:.2f} ms -> {after:.2f} ms (+{change:.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
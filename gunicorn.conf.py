@@ -0,0 +1,60 @@
+"""Gunicorn settings for serving the resume analyzer in production.
+
+Every setting can be overridden from the environment. The app is imported and
+warmed up once in the master (preload_app) and workers are forked from it.
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Analysis is CPU bound, so default to one process per core with a few threads
+# each to overlap upload I/O and the sandboxed extraction wait
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Each worker already gets a core, so keep its page extraction pool small
+os.environ.setdefault('WORKER_PROCESSES', '2')
+
+# Workers only share what is on disk, so keep the candidate index, the analysis history, job
+# descriptions, async jobs and metrics where every worker, including the ones that replace recycled
+# workers, can reach them
+state_dir = os.environ.get('RESUME_ANALYZER_STATE_DIR', os.path.join(tempfile.gettempdir(), 'resume_analyzer'))
+os.makedirs(state_dir, exist_ok=True)
+os.environ.setdefault('JD_INDEX_DB', os.path.join(state_dir, 'job_descriptions.sqlite3'))
+os.environ.setdefault('JOB_QUEUE_DB', os.path.join(state_dir, 'jobs.sqlite3'))
+os.environ.setdefault('CANDIDATE_INDEX_DIR', os.path.join(state_dir, 'candidates'))
+os.environ.setdefault('ANALYSIS_HISTORY_DB', os.path.join(state_dir, 'analysis_history.sqlite3'))
+os.environ.setdefault('METRICS_DIR', os.path.join(state_dir, 'metrics'))
+
+preload_app = True
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Outlast the extraction timeout so slow documents are rejected rather than the worker killed
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Recycle workers periodically to bound slow growth from parser caches
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Start the metrics from zero, rather than adding to those of the last server run"""
+    for path in glob.glob(os.path.join(os.environ['METRICS_DIR'], '*.json')):
+        if os.path.basename(path) != f'{os.getpid()}.json':
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    """Give each worker its own page pool and SQLite connections, and start its extraction sandbox"""
+    import app
+    app.reset_after_fork()
+    if app.EXTRACTION_SANDBOX:
+        app.get_sandbox_pool()
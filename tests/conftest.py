@@ -0,0 +1,12 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the tests off any persistent stores configured in the environment
+os.environ.pop('RESULT_CACHE_DB', None)
+os.environ.pop('ANALYSIS_HISTORY_DB', None)
+os.environ.pop('CANDIDATE_INDEX_DIR', None)
+os.environ.pop('ANALYTICS_DIR', None)
+os.environ.pop('JD_INDEX_DB', None)
+os.environ.pop('JOB_QUEUE_DB', None)
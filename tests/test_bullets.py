@@ -0,0 +1,62 @@
+import pytest
+
+import app
+
+
+def bullets(content, max_bullets=None):
+    return app.format_sections({'experience': content}, max_bullets)['experience']
+
+
+def test_hyphenated_words_stay_whole():
+    assert bullets('Built models with scikit-learn and real-time dashboards') == [
+        'Built models with scikit-learn and real-time dashboards']
+
+
+@pytest.mark.parametrize('marker', ['-', '*', '•', '–', '1.', '2)', 'a)', '(iv)', 'ii)'])
+def test_line_markers_are_stripped(marker):
+    assert bullets(f"{marker} Designed the billing platform\n{marker} Migrated invoices to PostgreSQL") == [
+        'Designed the billing platform', 'Migrated invoices to PostgreSQL']
+
+
+def test_nested_numbering():
+    content = ('1. Designed the billing platform\n'
+               '1.1 Migrated invoices to PostgreSQL\n'
+               '1.2. Automated the monthly reports\n'
+               '2) Reduced costs by 20 percent')
+    assert bullets(content) == ['Designed the billing platform', 'Migrated invoices to PostgreSQL',
+                                'Automated the monthly reports', 'Reduced costs by 20 percent']
+
+
+def test_version_numbers_are_not_markers():
+    assert bullets('Upgraded the service to Python 3.11 and Django 4.2') == [
+        'Upgraded the service to Python 3.11 and Django 4.2']
+
+
+def test_spaced_dash_and_glyph_split_a_line():
+    assert bullets('Designed the billing platform - Migrated invoices to PostgreSQL • Automated the reports') == [
+        'Designed the billing platform', 'Migrated invoices to PostgreSQL', 'Automated the reports']
+
+
+def test_short_fragments_are_dropped():
+    content = '2019 - 2021\n- Designed the billing platform\n- SQL\n\n'
+    assert bullets(content) == ['Designed the billing platform']
+
+
+def test_bullets_are_stripped():
+    assert bullets('  -   Designed the billing platform   \r\n\t- Migrated invoices to PostgreSQL \t') == [
+        'Designed the billing platform', 'Migrated invoices to PostgreSQL']
+
+
+def test_max_bullets():
+    content = '- Designed the billing platform\n- Migrated invoices to PostgreSQL\n- Automated the reports'
+    assert bullets(content, max_bullets=1) == ['Designed the billing platform']
+    assert bullets(content, max_bullets=5) == bullets(content)
+
+
+def test_cached_formatting_matches():
+    sections = {'experience': '- Designed the billing platform\n- Migrated invoices to PostgreSQL',
+                'skills': 'scikit-learn, numpy and pandas', 'summary': ''}
+    expected = app.format_sections(sections, 1)
+    assert app.format_sections_cached(sections, 1) == expected
+    assert app.format_sections_cached(sections, 1) == expected
+    assert 'summary' not in expected
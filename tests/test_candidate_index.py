@@ -0,0 +1,84 @@
+import app
+
+
+def result(*skills):
+    return {
+        'word_count': 300,
+        'sections': {'experience': '', 'skills': ''},
+        'skills_analysis': {'technical_skills': list(skills), 'soft_skills': [], 'skills_score': 50}
+    }
+
+
+def found(index, *skills):
+    return [match['candidate_id'] for match in index.search(list(skills))]
+
+
+def test_search_ranks_by_share_of_skills():
+    index = app.CandidateIndex()
+    index.add('a', result('python'))
+    index.add('b', result('python', 'docker'))
+    index.add('c', result('java'))
+    assert found(index, 'python', 'docker') == ['b', 'a']
+    assert index.search(['python', 'docker'])[1]['missing_skills'] == ['docker']
+
+
+def test_replacing_a_candidate_drops_its_old_skills():
+    index = app.CandidateIndex()
+    index.add('a', result('python'))
+    index.add('a', result('docker'))
+    assert found(index, 'python') == []
+    assert found(index, 'docker') == ['a']
+    assert len(index) == 1
+
+
+def test_memory_index_compacts_unused_slots():
+    index = app.CandidateIndex()
+    for _ in range(3):
+        for number in range(app.CandidateIndex.MIN_COMPACT_SLOTS):
+            index.add(f"c{number}", result('python'))
+    assert len(index) == app.CandidateIndex.MIN_COMPACT_SLOTS
+    assert len(index._candidates) <= 2 * app.CandidateIndex.MIN_COMPACT_SLOTS + 1
+    assert not index._pending
+    assert len(index.search(['python'], top_k=5000)) == app.CandidateIndex.MIN_COMPACT_SLOTS
+
+
+def test_save_and_load(tmp_path):
+    index = app.CandidateIndex(str(tmp_path))
+    index.add('a', result('python'))
+    index.add('b', result('docker'))
+    index.save()
+    assert found(app.CandidateIndex(str(tmp_path)), 'python') == ['a']
+
+
+def test_saves_from_two_instances_merge(tmp_path):
+    first = app.CandidateIndex(str(tmp_path))
+    second = app.CandidateIndex(str(tmp_path))
+    first.add('a', result('python'))
+    first.add('b', result('python', 'docker'))
+    first.save()
+    second.add('c', result('docker'))
+    second.save()
+    first.add('d', result('python'))
+    first.save()
+
+    merged = app.CandidateIndex(str(tmp_path))
+    assert sorted(found(merged, 'python', 'docker')) == ['a', 'b', 'c', 'd']
+    # Each save rebases the instance on the merged snapshot, so doc IDs stay dense
+    assert sorted(merged._doc_ids.values()) == [0, 1, 2, 3]
+
+
+def test_removal_is_merged_and_renumbered(tmp_path):
+    first = app.CandidateIndex(str(tmp_path))
+    for candidate_id in 'abc':
+        first.add(candidate_id, result('python'))
+    first.save()
+    second = app.CandidateIndex(str(tmp_path))
+    assert second.remove('a')
+    second.add('b', result('docker'))
+    second.save()
+
+    merged = app.CandidateIndex(str(tmp_path))
+    assert found(merged, 'python') == ['c']
+    assert found(merged, 'docker') == ['b']
+    assert sorted(merged._doc_ids.values()) == [0, 1]
+    assert not merged.remove('a')
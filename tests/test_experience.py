@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+import app
+
+
+def experience(*lines):
+    return app.extract_entities('Experience\n' + '\n'.join(lines), backend='rules')
+
+
+def date_range(text):
+    match = app._DATE_RANGE_RE.search(text.lower())
+    today = datetime.date.today()
+    return match and (app._month_index(match, 'start', today), app._month_index(match, 'end', today))
+
+
+@pytest.mark.parametrize('text, first, last', [
+    ('Jan 2019 - Mar 2020', (2019, 1), (2020, 3)),
+    ('January 2019 to March 2020', (2019, 1), (2020, 3)),
+    ('Sept. 2018 – June 2019', (2018, 9), (2019, 6)),
+    ('03/2017 to 06/2019', (2017, 3), (2019, 6)),
+    ('3.2017—12.2019', (2017, 3), (2019, 12)),
+    ('2015 until 2018', (2015, 1), (2018, 1)),
+])
+def test_date_ranges(text, first, last):
+    assert date_range(text) == (first[0] * 12 + first[1] - 1, last[0] * 12 + last[1] - 1)
+
+
+@pytest.mark.parametrize('word', ['Present', 'current', 'now', 'today', 'date'])
+def test_open_ranges_end_this_month(word):
+    today = datetime.date.today()
+    assert date_range(f"Jan 2019 - {word}")[1] == today.year * 12 + today.month - 1
+
+
+@pytest.mark.parametrize('text', [
+    'Room 12019 - 22020',
+    'ISO 9001 - 2015',
+    'Revenue rose 2019 percent - 2020 target',
+])
+def test_non_dates(text):
+    assert date_range(text) is None
+
+
+def test_entry_title_employer_and_length():
+    entry, = experience('Senior Software Engineer at Acme Corp', 'Jan 2019 - Mar 2020')['employment']
+    assert entry == {'title': 'Senior Software Engineer', 'employer': 'Acme Corp',
+                     'start': '2019-01', 'end': '2020-03', 'months': 14}
+
+
+def test_overlapping_roles_are_not_double_counted():
+    entities = experience('Jan 2018 - Dec 2019', 'Jan 2019 - Dec 2020', 'Mar 2019 - Jun 2019')
+    assert entities['total_years_experience'] == round(35 / 12, 1)
+
+
+def test_gaps_between_roles_are_not_counted():
+    entities = experience('Jan 2015 - Jan 2016', 'Jan 2018 - Jan 2019')
+    assert entities['total_years_experience'] == 2.0
+
+
+def test_reversed_ranges_are_ignored():
+    assert experience('Jan 2020 - Jan 2018')['employment'] == []
+
+
+def test_dates_outside_experience_are_ignored():
+    text = 'Education\nBSc in Physics, 2010 - 2014\nExperience\nEngineer at Acme, 2015 - 2016'
+    entities = app.extract_entities(text, backend='rules')
+    assert [entry['start'] for entry in entities['employment']] == ['2015-01']
+    assert entities['degrees'] == ['BSc in Physics']
@@ -0,0 +1,90 @@
+import pytest
+
+import app
+
+JD_TEXT = ('Backend engineer. Requirements: Python, Python and more Python, PostgreSQL and Docker. '
+           'Experience with payments systems.')
+
+
+@pytest.fixture
+def index(tmp_path):
+    return app.JobDescriptionIndex(str(tmp_path / 'job_descriptions.sqlite3'), max_entries=10)
+
+
+def resume(text):
+    lowered = app.lower_preserving_offsets(text)
+    skills = app.extract_skills(text, lowered)
+    return lowered, skills['technical'] + skills['soft']
+
+
+def test_repeated_skills_weigh_more(index):
+    jd = index.add(JD_TEXT, 'backend')
+    assert jd.skills[0] == 'python'
+    assert {'postgresql', 'docker'} <= set(jd.skills)
+    assert jd.skill_weights[0] > jd.skill_weights[-1]
+
+
+def test_scores_rank_by_skill_coverage(index):
+    jd = index.add(JD_TEXT, 'backend')
+    full, partial, none = index.score(jd, [
+        resume('Built payments systems in Python on PostgreSQL, deployed with Docker'),
+        resume('Built payments systems in Python'),
+        resume('Painted houses and fixed bicycles'),
+    ])
+    assert full['skill_score'] == 100
+    assert not full['missing_skills']
+    assert full['score'] > partial['score'] > none['score']
+    assert partial['matched_skills'] == ['python']
+    assert none['score'] == 0
+
+
+def test_text_relevance_alone_without_jd_skills(index):
+    jd = index.add('Shepherd wanted for a hill farm, lambing season', 'shepherd')
+    assert jd.skills == []
+    hit, miss = index.score(jd, [resume('Shepherd on a hill farm through lambing'), resume('Accountant')])
+    assert hit['score'] == hit['text_score'] > 0
+    assert miss['score'] == 0
+
+
+def test_longer_resumes_are_length_normalized(index):
+    jd = index.add('Shepherd wanted for a hill farm', 'shepherd')
+    short, padded = index.score(jd, [resume('Shepherd on a hill farm'),
+                                     resume('Shepherd on a hill farm ' + 'gardening ' * 50)])
+    assert short['text_score'] > padded['text_score']
+
+
+def test_shared_terms_get_lower_idf(index):
+    jd = index.add('Engineer for payments', 'payments')
+    index.add('Engineer for search', 'search')
+    weights = dict(zip(jd.terms, index.idf(jd)))
+    assert weights['engineer'] < weights['payments']
+
+
+def test_empty_batch_scores_nothing(index):
+    assert index.score(index.add(JD_TEXT, 'backend'), []) == []
+
+
+def test_instances_sharing_a_store_see_each_other(index):
+    other = app.JobDescriptionIndex(index.path, max_entries=10)
+    index.add(JD_TEXT, 'backend', 'Backend engineer')
+    assert other.get('backend').title == 'Backend engineer'
+    index.add('Frontend engineer with React', 'backend')
+    assert other.get('backend').skills == ['react']
+    assert index.remove('backend')
+    assert other.get('backend') is None
+    assert len(other) == 0
+
+
+def test_store_keeps_the_newest_max_entries(tmp_path):
+    index = app.JobDescriptionIndex(str(tmp_path / 'job_descriptions.sqlite3'), max_entries=2)
+    for jd_id in ['first', 'second', 'third']:
+        index.add(JD_TEXT, jd_id)
+    assert len(index) == 2
+    assert index.get('first') is None
+
+
+def test_unset_path_is_private(index):
+    private = app.JobDescriptionIndex(None, max_entries=10)
+    private.add(JD_TEXT, 'backend')
+    assert private.path != index.path
+    assert index.get('backend') is None
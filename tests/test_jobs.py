@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import app
+
+HOLD_SLOT = '''
+import fcntl, os, sys, time
+slot = open(sys.argv[1], 'a+')
+fcntl.flock(slot, fcntl.LOCK_EX)
+slot.write(str(os.getpid()))
+slot.flush()
+print('ready', flush=True)
+time.sleep(60)
+'''
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'JOB_WORKERS', 2)
+    monkeypatch.setattr(app, 'JOB_TIMEOUT', 1)
+    return app.JobQueue(str(tmp_path / 'jobs.sqlite3'), max_pending=2)
+
+
+def start_stuck_job(queue, pid):
+    started = time.time() - 10
+    queue._db.get().execute("INSERT INTO jobs (id, status, created, started, worker) VALUES (?, 'running', ?, ?, ?)",
+                            (f"job{pid}", started, started, pid))
+
+
+def test_jobs_run_in_order(queue):
+    first = queue.enqueue('a.pdf', b'a')
+    queue.enqueue('b.pdf', b'b')
+    job_id, filename, payload = queue.claim()
+    assert (job_id, filename, payload) == (first, 'a.pdf', b'a')
+    queue.complete(job_id, '{"word_count": 1}')
+    job = queue.get(job_id)
+    assert job['status'] == 'done'
+    assert job['result'] == {'word_count': 1}
+
+
+def test_enqueue_refuses_past_max_pending(queue):
+    queue.enqueue('a.pdf', b'a')
+    queue.enqueue('b.pdf', b'b')
+    with pytest.raises(app.QueueFull):
+        queue.enqueue('c.pdf', b'c')
+
+
+def test_worker_slots_are_capped(queue):
+    slots = [app.claim_job_worker_slot(queue.path) for _ in range(2)]
+    assert None not in slots
+    assert app.claim_job_worker_slot(queue.path) is None
+    assert app.job_worker_pids(queue.path) == {os.getpid()}
+    slots[0].close()
+    slot = app.claim_job_worker_slot(queue.path)
+    assert slot is not None
+    slot.close()
+    slots[1].close()
+    assert app.job_worker_pids(queue.path) == set()
+
+
+def test_expire_kills_a_stuck_worker(queue):
+    worker = subprocess.Popen([sys.executable, '-c', HOLD_SLOT, app._job_worker_slot(queue.path, 0)],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        assert worker.stdout.readline().strip() == 'ready'
+        assert app.job_worker_pids(queue.path) == {worker.pid}
+        start_stuck_job(queue, worker.pid)
+        queue.expire()
+        assert worker.wait(timeout=5) == -9
+        assert queue.get(f"job{worker.pid}")['error'] == 'Job timed out'
+    finally:
+        worker.kill()
+        worker.wait()
+        worker.stdout.close()
+
+
+def test_expire_spares_a_process_without_a_slot(queue):
+    bystander = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    try:
+        start_stuck_job(queue, bystander.pid)
+        queue.expire()
+        assert queue.get(f"job{bystander.pid}")['status'] == 'failed'
+        assert bystander.poll() is None
+    finally:
+        bystander.kill()
+        bystander.wait()
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'results.sqlite3')
+
+
+def store(cache, key, size, age):
+    cache._db.get().execute('INSERT INTO results (key, payload, stored_at, size) VALUES (?, ?, ?, ?)',
+                            (key, b'x' * size, time.time() - age, size))
+
+
+def disk_keys(cache):
+    return {key for (key,) in cache._db.get().execute('SELECT key FROM results')}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = app.ResultCache(max_entries=2, max_bytes=1024)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    cache.get('a')
+    cache.put('c', b'3')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_memory_tier_is_bounded_by_bytes():
+    cache = app.ResultCache(max_entries=10, max_bytes=10)
+    cache.put('a', b'x' * 6)
+    cache.put('b', b'x' * 6)
+    assert cache.get('a') is None
+    cache.put('big', b'x' * 11)
+    assert cache.get('big') is None
+    assert cache.stats()['bytes'] == 6
+
+
+def test_disk_tier_is_shared_between_instances(db_path):
+    app.ResultCache(max_entries=10, max_bytes=1024, db_path=db_path).put('a', b'1')
+    other = app.ResultCache(max_entries=10, max_bytes=1024, db_path=db_path)
+    assert other.get('a') == b'1'
+    assert other.stats()['disk_hits'] == 1
+
+
+def test_expired_results_are_not_served(db_path):
+    cache = app.ResultCache(max_entries=10, max_bytes=1024, db_path=db_path, disk_ttl=60)
+    store(cache, 'old', 1, age=120)
+    assert cache.get('old') is None
+
+
+def test_disk_eviction_drops_expired_results(db_path):
+    cache = app.ResultCache(max_entries=10, max_bytes=1024, db_path=db_path, disk_ttl=60)
+    store(cache, 'old', 1, age=120)
+    store(cache, 'new', 1, age=0)
+    cache._evict_disk(cache._db.get())
+    assert disk_keys(cache) == {'new'}
+    assert cache.stats()['disk_evictions'] == 1
+
+
+def test_disk_eviction_keeps_the_newest_results_within_budget(db_path):
+    cache = app.ResultCache(max_entries=10, max_bytes=1024, db_path=db_path, disk_max_bytes=100)
+    for age, key in enumerate(['newest', 'newer', 'older', 'oldest']):
+        store(cache, key, 40, age=age)
+    cache._evict_disk(cache._db.get())
+    # The running total reaches 120 bytes at the third newest result
+    assert disk_keys(cache) == {'newest', 'newer'}
+    assert cache.stats()['disk_bytes'] == 80
+
+
+def test_puts_evict_from_disk_periodically(db_path, monkeypatch):
+    monkeypatch.setattr(app.ResultCache, 'DISK_EVICT_EVERY', 3)
+    cache = app.ResultCache(max_entries=10, max_bytes=1024, db_path=db_path, disk_max_bytes=25)
+    for key in 'abc':
+        cache.put(key, b'x' * 10)
+    assert cache.stats()['disk_bytes'] == 20
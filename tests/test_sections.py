@@ -0,0 +1,62 @@
+import pytest
+
+import app
+
+RESUME = ('Jane Doe\n'
+          'Professional Summary\n'
+          'Backend engineer.\n'
+          'Work Experience:\n'
+          'Engineer at Acme, 2019 - 2021\n'
+          'EDUCATION\n'
+          'BSc in Physics\n'
+          'Technical Skills: Python, SQL\n')
+
+
+def names(text):
+    return [span.name for span in app.segment_sections(text)]
+
+
+def test_sections_are_found_in_order():
+    assert names(RESUME) == ['summary', 'experience', 'education', 'skills']
+
+
+def test_spans_cover_the_text_up_to_the_next_header():
+    spans = app.segment_sections(RESUME)
+    assert RESUME[spans[1].start:spans[1].body_start] == 'Work Experience:'
+    assert RESUME[spans[1].body_start:spans[1].end].strip() == 'Engineer at Acme, 2019 - 2021'
+    assert spans[-1].end == len(RESUME)
+    assert all(span.end == following.start for span, following in zip(spans, spans[1:]))
+
+
+def test_longest_synonym_wins():
+    assert names('Professional Experience\nAcme') == ['experience']
+    assert app.segment_sections('Professional Experience\nAcme')[0].body_start == len('Professional Experience')
+
+
+@pytest.mark.parametrize('line', [
+    'My experience includes Python',
+    'Skills gained at Acme',
+    'Summary of results follows here',
+])
+def test_header_words_inside_a_sentence_are_not_headers(line):
+    assert names(line) == []
+
+
+def test_headers_may_be_indented_and_spaced():
+    assert names('  work   history  \r\nAcme\n\tskills:\tPython') == ['experience', 'skills']
+
+
+def test_offsets_survive_case_folding_that_changes_length():
+    text = 'İstanbul\nSkills: Python'
+    span = app.segment_sections(text)[0]
+    assert text[span.body_start:span.end].strip() == 'Python'
+
+
+def test_repeated_sections_are_joined():
+    sections = app.extract_sections('Skills: Python\nExperience\nAcme\nSkills\nSQL')
+    assert sections['skills'] == 'Python\nSQL'
+    assert sections['experience'] == 'Acme'
+
+
+def test_no_headers_no_sections():
+    assert app.extract_sections('Just a paragraph about a person') == {}
@@ -0,0 +1,58 @@
+import pytest
+
+import app
+
+TextBlob = pytest.importorskip('textblob').TextBlob
+
+
+@pytest.fixture(autouse=True)
+def lexicon():
+    if app.get_component('sentiment_lexicon') is None:
+        pytest.skip('the sentiment lexicon is not available')
+
+
+@pytest.mark.parametrize('text', [
+    # Negations halve and flip the polarity of the next known word
+    'not good',
+    'This is not a very good result',
+    'never terrible',
+    "It isn't great",
+    'not very bad',
+    # Known adverbs scale the next known word by their intensity
+    'very good',
+    'I am extremely happy',
+    'The team was terribly slow',
+    'really really good',
+    # '!' boosts the previous word group
+    'very good!',
+    'great!!',
+    'bad!',
+    'Excellent work! Highly motivated and very reliable.',
+    # No known words at all
+    '',
+    'Python, SQL, 2019-2021',
+])
+def test_lexicon_matches_textblob(text):
+    polarity, subjectivity, _ = app.score_sentiment(text, backend='lexicon', per_section=False)
+    expected = TextBlob(text).sentiment
+    assert polarity == pytest.approx(expected.polarity, abs=1e-9)
+    assert subjectivity == pytest.approx(expected.subjectivity, abs=1e-9)
+
+
+def test_resume_text_matches_textblob():
+    text = ('Professional Summary\nMotivated engineer with a positive attitude and great teamwork.\n'
+            'Experience\n- Led a small team, never missing a deadline!\n- Improved a slow, unreliable build.\n')
+    polarity, subjectivity, sections = app.score_sentiment(text, backend='lexicon')
+    expected = TextBlob(text).sentiment
+    assert polarity == pytest.approx(expected.polarity, abs=1e-9)
+    assert subjectivity == pytest.approx(expected.subjectivity, abs=1e-9)
+    assert set(sections) == {'summary', 'experience'}
+
+
+def test_section_scores_match_textblob_on_the_section_body():
+    text = 'Summary\nA great and reliable engineer.\nSkills\nPython, SQL\n'
+    _, _, sections = app.score_sentiment(text, backend='lexicon', per_section=True)
+    expected = TextBlob('A great and reliable engineer.').sentiment
+    assert sections['summary'] == {'polarity': round(expected.polarity, 2),
+                                   'subjectivity': round(expected.subjectivity, 2)}
+    assert sections['skills'] == {'polarity': 0.0, 'subjectivity': 0.0}
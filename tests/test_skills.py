@@ -0,0 +1,74 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def matcher():
+    return app.SkillMatcher(
+        {
+            'languages': ['python', 'java', 'javascript', 'c++', 'c#', 'r', 'go'],
+            'frameworks': ['node.js', 'react', 'scikit-learn'],
+            'soft': ['leadership', 'teamwork']
+        },
+        aliases={'js': 'javascript', 'golang': 'go', 'react.js': 'react', 'sklearn': 'scikit-learn',
+                 'team work': 'teamwork'}
+    )
+
+
+def skills(matcher, text):
+    return [(match.skill, text[match.start:match.end]) for match in matcher.scan(text)]
+
+
+@pytest.mark.parametrize('text', [
+    'Good for large codebases',
+    'Worked on pythonic tooling',
+    'Javanese culture',
+    'python3 scripts',
+    'go_routine helpers',
+])
+def test_short_skills_only_match_whole_words(matcher, text):
+    assert skills(matcher, text) == []
+
+
+def test_skills_match_on_word_boundaries(matcher):
+    assert skills(matcher, 'Go, R and Python (Java)') == [
+        ('go', 'Go'), ('r', 'R'), ('python', 'Python'), ('java', 'Java')]
+
+
+def test_symbols_are_part_of_the_skill(matcher):
+    assert skills(matcher, 'C++ and C# with scikit-learn') == [
+        ('c++', 'C++'), ('c#', 'C#'), ('scikit-learn', 'scikit-learn')]
+
+
+def test_longest_and_shorter_skills_at_one_position(matcher):
+    assert skills(matcher, 'java, javascript') == [('java', 'java'), ('javascript', 'javascript')]
+
+
+def test_aliases_report_the_canonical_skill(matcher):
+    assert skills(matcher, 'JS, golang, sklearn and team work') == [
+        ('javascript', 'JS'), ('go', 'golang'), ('scikit-learn', 'sklearn'), ('teamwork', 'team work')]
+
+
+def test_alias_does_not_match_inside_a_dotted_skill(matcher):
+    assert skills(matcher, 'Node.js services') == [('node.js', 'Node.js')]
+
+
+def test_dotted_alias_also_reports_its_prefix(matcher):
+    assert skills(matcher, 'react.js') == [('react', 'react'), ('react', 'react.js')]
+
+
+def test_alias_to_unknown_skill_is_rejected():
+    with pytest.raises(ValueError):
+        app.SkillMatcher({'languages': ['python']}, aliases={'py': 'pyhton'})
+
+
+def test_canonical(matcher):
+    assert matcher.canonical('JS') == 'javascript'
+    assert matcher.canonical('Cobol') == 'cobol'
+
+
+def test_extract_skills_groups_in_taxonomy_order():
+    taxonomy = app.get_taxonomy()
+    found = app.extract_skills('Teamwork, k8s, Python and leadership', taxonomy=taxonomy)
+    assert found == {'technical': ['python', 'kubernetes'], 'soft': ['leadership', 'teamwork']}
@@ -0,0 +1,18 @@
+"""WSGI entry point for production serving.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Importing this module loads the app and warms it up, so with preload_app the
+gunicorn master does it once and every worker inherits the warm state.
+"""
+import gc
+
+from app import app, warm_up
+
+warm_up()
+
+# Move everything loaded so far out of the collector's reach, so collections in
+# the workers do not touch (and copy) the pages they share with the master
+gc.freeze()
+
+application = app